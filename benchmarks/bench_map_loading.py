@@ -0,0 +1,68 @@
+"""
+Compares the time to load a Map with dacite and with Map.from_dict, for synthetic
+maps with an increasing number of reference positions.
+
+    python benchmarks/bench_map_loading.py
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from alitra import Map
+
+
+def write_map_config(path: Path, n_positions: int) -> None:
+    frame = {"name": "robot"}
+    positions = np.random.default_rng(0).uniform(-100, 100, size=(n_positions, 3))
+    map_config = {
+        "name": f"map_{n_positions}",
+        "frame": frame,
+        "reference_positions": {
+            "positions": [
+                {"x": x, "y": y, "z": z, "frame": frame}
+                for x, y, z in positions.tolist()
+            ],
+            "frame": frame,
+        },
+    }
+    with open(path, "w") as json_file:
+        json.dump(map_config, json_file)
+
+
+def time_load(path: Path, use_dacite: bool, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Map.from_config(path, use_dacite=use_dacite)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'positions':>10} {'dacite [s]':>12} {'from_dict [s]':>14} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n_positions in args.sizes:
+            path = Path(directory) / f"map_{n_positions}.json"
+            write_map_config(path, n_positions)
+            dacite_time = time_load(path, use_dacite=True, repeat=args.repeat)
+            fast_time = time_load(path, use_dacite=False, repeat=args.repeat)
+            print(
+                f"{n_positions:>10} {dacite_time:>12.5f} {fast_time:>14.5f} "
+                + f"{dacite_time / fast_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Compares the memory per object of the slot based models with equivalent dataclasses
+that store their fields in a per-instance __dict__, as the models did before.
+
+    python benchmarks/bench_model_memory.py
+"""
+
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List
+
+from alitra import Frame, Orientation, Pose, Position, Translation
+
+
+@dataclass
+class DictPosition:
+    x: float
+    y: float
+    z: float
+    frame: Frame
+
+
+@dataclass
+class DictOrientation:
+    x: float
+    y: float
+    z: float
+    w: float
+    frame: Frame
+
+
+@dataclass
+class DictPose:
+    position: DictPosition
+    orientation: DictOrientation
+    frame: Frame
+
+
+@dataclass
+class DictTranslation:
+    x: float
+    y: float
+    from_: Frame
+    to_: Frame
+    z: float = 0
+
+
+def bytes_per_object(create: Callable[[int], object], n_objects: int) -> float:
+    """
+    :return: Bytes allocated per object, including its float fields
+    """
+    tracemalloc.start()
+    objects: List[object] = [create(i) for i in range(n_objects)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    # The list itself holds one pointer per object
+    return size / n_objects - 8
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=100_000)
+    args = parser.parse_args()
+
+    frame = Frame("robot")
+    other_frame = Frame("asset")
+    models = {
+        "Position": (
+            lambda i: DictPosition(i + 0.1, i + 0.2, i + 0.3, frame),
+            lambda i: Position(i + 0.1, i + 0.2, i + 0.3, frame),
+        ),
+        "Orientation": (
+            lambda i: DictOrientation(i + 0.1, i + 0.2, i + 0.3, i + 0.4, frame),
+            lambda i: Orientation(i + 0.1, i + 0.2, i + 0.3, i + 0.4, frame),
+        ),
+        "Pose": (
+            lambda i: DictPose(
+                DictPosition(i + 0.1, i + 0.2, i + 0.3, frame),
+                DictOrientation(i + 0.1, i + 0.2, i + 0.3, i + 0.4, frame),
+                frame,
+            ),
+            lambda i: Pose(
+                Position(i + 0.1, i + 0.2, i + 0.3, frame),
+                Orientation(i + 0.1, i + 0.2, i + 0.3, i + 0.4, frame),
+                frame,
+            ),
+        ),
+        "Translation": (
+            lambda i: DictTranslation(i + 0.1, i + 0.2, frame, other_frame, i + 0.3),
+            lambda i: Translation(i + 0.1, i + 0.2, frame, other_frame, i + 0.3),
+        ),
+    }
+
+    print(f"{'model':>12} {'__dict__ [B]':>13} {'slots [B]':>10} {'saving':>7}")
+    for name, (create_dict, create_slots) in models.items():
+        dict_bytes = bytes_per_object(create_dict, args.objects)
+        slots_bytes = bytes_per_object(create_slots, args.objects)
+        print(
+            f"{name:>12} {dict_bytes:>13.0f} {slots_bytes:>10.0f} "
+            + f"{1 - slots_bytes / dict_bytes:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+Benchmarks the public entry points of alitra for a range of input sizes and rotation
+axes, and reports latency, throughput and peak memory for each case. Results are
+written as json so runs of different versions can be compared.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --sizes 10 1000 --compare results.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from bench_map_loading import write_map_config
+from scipy.spatial.transform import Rotation
+
+from alitra import (
+    Frame,
+    Map,
+    PoseArray,
+    Positions,
+    Transform,
+    Translation,
+    align_positions,
+    align_positions_ransac,
+)
+
+ROT_AXES = ["x", "y", "z", "xyz"]
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+
+@dataclass
+class Case:
+    """
+    A benchmark case. setup is called once and returns the function that is timed,
+    so creating the inputs is not part of the measurements
+    """
+
+    name: str
+    params: Dict[str, object]
+    n: int
+    setup: Callable[[], Callable[[], object]]
+
+
+@dataclass
+class Result:
+    name: str
+    params: Dict[str, object]
+    n: int
+    repeat: int
+    latency_min: float
+    latency_median: float
+    throughput: float
+    peak_memory_bytes: int
+
+
+def get_transform(rot_axes: str, from_: Frame, to_: Frame) -> Transform:
+    euler = {"x": [0, 0, 0.7], "y": [0, 0.7, 0], "z": [0.7, 0, 0]}.get(
+        rot_axes, [0.7, 0.3, 0.2]
+    )
+    return Transform.from_euler_array(
+        translation=Translation(x=10, y=-20, z=3, from_=from_, to_=to_),
+        euler=np.array(euler),
+        from_=from_,
+        to_=to_,
+    )
+
+
+def get_cases(
+    sizes: List[int], rot_axes_list: List[str], max_edges_n: int, tmp_dir: Path
+) -> Iterator[Case]:
+    from_, to_ = Frame("robot"), Frame("asset")
+
+    def positions(n: int) -> np.ndarray:
+        return np.random.default_rng(n).uniform(-100, 100, size=(n, 3))
+
+    for n in sizes:
+        transform = get_transform("xyz", from_, to_)
+
+        def setup_from_array(n=n):
+            array = positions(n)
+            return lambda: Positions.from_array(array, from_)
+
+        def setup_transform_position(n=n, transform=transform):
+            positions_from = Positions.from_array(positions(n), from_)
+            return lambda: transform.transform_position(positions_from, from_, to_)
+
+        def setup_transform_array_out(n=n, transform=transform):
+            array = positions(n)
+            out = np.empty_like(array)
+            return lambda: transform.transform_array(array, from_, to_, out=out)
+
+        def setup_transform_pose(n=n, transform=transform):
+            poses = PoseArray(
+                Positions.from_array(positions(n), from_),
+                Rotation.random(n, random_state=n).as_quat(),
+                from_,
+            )
+            return lambda: transform.transform_pose(poses, from_, to_)
+
+        yield Case("Positions.from_array", {}, n, setup_from_array)
+        yield Case("Transform.transform_position", {}, n, setup_transform_position)
+        yield Case("Transform.transform_array[out]", {}, n, setup_transform_array_out)
+        yield Case("Transform.transform_pose[PoseArray]", {}, n, setup_transform_pose)
+
+        for rot_axes in rot_axes_list:
+            if n < 3:
+                continue
+            transform = get_transform(rot_axes, from_, to_)
+
+            def setup_align(method, n=n, rot_axes=rot_axes, transform=transform):
+                positions_from = Positions.from_array(positions(n), from_)
+                positions_to = transform.transform_position(positions_from, from_, to_)
+                return lambda: align_positions(
+                    positions_from, positions_to, rot_axes, method=method
+                )
+
+            for method in ("edges", "centroid"):
+                if method == "edges" and n > max_edges_n:
+                    continue
+                yield Case(
+                    "align_positions",
+                    {"rot_axes": rot_axes, "method": method},
+                    n,
+                    lambda setup=setup_align, method=method: setup(method=method),
+                )
+
+            if n <= max_edges_n:
+
+                def setup_ransac(n=n, rot_axes=rot_axes, transform=transform):
+                    positions_from = Positions.from_array(positions(n), from_)
+                    positions_to = transform.transform_position(
+                        positions_from, from_, to_
+                    )
+                    return lambda: align_positions_ransac(
+                        positions_from, positions_to, rot_axes, seed=0
+                    )
+
+                yield Case(
+                    "align_positions_ransac", {"rot_axes": rot_axes}, n, setup_ransac
+                )
+
+        path = tmp_dir / f"map_{n}.json"
+
+        def setup_map_config(n=n, path=path, use_dacite=True):
+            if not path.exists():
+                write_map_config(path, n)
+            return lambda: Map.from_config(path, use_dacite=use_dacite)
+
+        def setup_map_binary(n=n, path=path):
+            directory = tmp_dir / f"map_{n}"
+            if not directory.exists():
+                if not path.exists():
+                    write_map_config(path, n)
+                Map.from_config(path, use_dacite=False).to_binary(directory)
+            return lambda: Map.from_binary(directory)
+
+        # Loading with dacite is an order of magnitude slower than without
+        if n <= 100 * max_edges_n:
+            yield Case(
+                "Map.from_config",
+                {"use_dacite": True},
+                n,
+                lambda setup=setup_map_config: setup(use_dacite=True),
+            )
+        yield Case(
+            "Map.from_config",
+            {"use_dacite": False},
+            n,
+            lambda setup=setup_map_config: setup(use_dacite=False),
+        )
+        yield Case("Map.from_binary", {}, n, setup_map_binary)
+
+
+def run_case(case: Case, repeat: int, min_duration: float) -> Result:
+    function = case.setup()
+    function()
+
+    durations: List[float] = []
+    start = time.perf_counter()
+    while len(durations) < repeat or time.perf_counter() - start < min_duration:
+        call_start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - call_start)
+        if len(durations) >= 100 * repeat:
+            break
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(durations)
+    return Result(
+        name=case.name,
+        params=case.params,
+        n=case.n,
+        repeat=len(durations),
+        latency_min=min(durations),
+        latency_median=median,
+        throughput=case.n / median if median > 0 else 0.0,
+        peak_memory_bytes=peak,
+    )
+
+
+def get_metadata() -> Dict[str, object]:
+    def version(package: str) -> str:
+        try:
+            return metadata.version(package)
+        except metadata.PackageNotFoundError:
+            return "unknown"
+
+    try:
+        process = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        )
+        commit = process.stdout.strip() if process.returncode == 0 else "unknown"
+    except OSError:
+        commit = "unknown"
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "alitra": version("alitra"),
+        "commit": commit,
+        "numpy": np.__version__,
+        "scipy": version("scipy"),
+    }
+
+
+def result_key(result: Dict[str, object]) -> Tuple[str, str, int]:
+    return (
+        str(result["name"]),
+        json.dumps(result["params"], sort_keys=True),
+        int(result["n"]),
+    )
+
+
+def print_result(result: Result, baseline: Optional[Dict[str, object]]) -> None:
+    params = ",".join(f"{key}={value}" for key, value in result.params.items())
+    line = (
+        f"{result.name + ('[' + params + ']' if params else ''):<58} "
+        + f"{result.n:>8} {result.latency_median * 1e3:>11.3f} "
+        + f"{result.throughput:>13.0f} {result.peak_memory_bytes / 1e6:>9.2f}"
+    )
+    if baseline is not None:
+        line += f" {result.latency_median / baseline['latency_median']:>8.2f}x"
+    print(line, flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--rot-axes", nargs="+", default=ROT_AXES, choices=ROT_AXES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-duration",
+        type=float,
+        default=0.2,
+        help="Minimum time in seconds to repeat each case for",
+    )
+    parser.add_argument(
+        "--max-edges-n",
+        type=int,
+        default=2_000,
+        help="Largest size for align_positions with edges and for RANSAC, which "
+        + "scale quadratically with the size",
+    )
+    parser.add_argument(
+        "--filter", default="", help="Only run cases whose name contains this"
+    )
+    parser.add_argument("--output", type=Path, help="Path to write json results to")
+    parser.add_argument(
+        "--compare", type=Path, help="json results to compare the median latency to"
+    )
+    args = parser.parse_args()
+
+    baselines: Dict[Tuple[str, str, int], Dict[str, object]] = {}
+    if args.compare is not None:
+        with open(args.compare) as json_file:
+            for result in json.load(json_file)["results"]:
+                baselines[result_key(result)] = result
+
+    header = (
+        f"{'case':<58} {'n':>8} {'median [ms]':>11} {'throughput/s':>13} "
+        + f"{'peak [MB]':>9}"
+    )
+    print(header + (f" {'vs base':>9}" if baselines else ""))
+
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for case in get_cases(
+            args.sizes, args.rot_axes, args.max_edges_n, Path(tmp_dir)
+        ):
+            if args.filter not in case.name:
+                continue
+            result = run_case(case, args.repeat, args.min_duration)
+            results.append(result)
+            print_result(result, baselines.get(result_key(asdict(result))))
+
+    if args.output is not None:
+        with open(args.output, "w") as json_file:
+            json.dump(
+                {
+                    "metadata": get_metadata(),
+                    "results": [asdict(result) for result in results],
+                },
+                json_file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -34,16 +34,37 @@ between the two frames.
 >>> transform = Transform(p_robot, p_asset, rotation_axes)
 """
 
-from alitra.alignment import align_maps, align_positions
+from alitra.alignment import (
+    AlignmentResult,
+    align_maps,
+    align_maps_batch,
+    align_maps_ransac,
+    align_positions,
+    align_positions_ransac,
+)
+from alitra.alignment_cache import AlignmentCache
+from alitra.incremental_alignment import IncrementalAligner
+from alitra.map_registry import MapRegistry
 from alitra.models import (
     Bounds,
     Frame,
     Map,
     MapAlignment,
     Orientation,
+    Orientations,
     Pose,
+    PoseArray,
     Position,
     Positions,
     Translation,
 )
+from alitra.service import ServiceStatistics, TransformClient, TransformService
+from alitra.streaming import (
+    StreamStatistics,
+    read_chunks,
+    transform_chunks,
+    transform_file,
+)
 from alitra.transform import Transform
+from alitra.transform_buffer import TransformBuffer
+from alitra.transform_tree import TransformTree
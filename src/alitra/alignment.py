@@ -1,20 +1,31 @@
-from typing import Literal, Tuple
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Literal, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from numpy.linalg import norm  # type: ignore
 from scipy.spatial.transform import Rotation
 
-from .models.map import Map
+from .alignment_cache import AlignmentCache
+from .instrumentation import instrumented
+from .models.map import Map, MapAlignment
 from .models.position import Positions
 from .models.translation import Translation
 from .transform import Transform
 
+_EDGE_CHUNK_SIZE = 2**20
+_ROT_AXIS_INDEX = {"x": 0, "y": 1, "z": 2}
+_RANSAC_CHUNK_SIZE = 64
+
 
 def align_maps(
     map_from: Map,
     map_to: Map,
     rot_axes: Literal["x", "y", "z", "xyz"],
     rsmd_threshold=0.4,
+    method: Literal["edges", "centroid"] = "edges",
+    cache: Optional[AlignmentCache] = None,
 ) -> Transform:
     """
     Uses align_positions to create a transform between two maps.
@@ -26,20 +37,117 @@ def align_maps(
         this is set to 'z'
     :param rsmd_threshold: The root mean square distance threshold, for the coordinate
         fitting error in matching the two coordinate systems.
+    :param method: Method used to find the rotation, see align_positions
+    :param cache: AlignmentCache to look up the transform in before aligning, and
+        to store it in after aligning
     """
-    return align_positions(
+    if cache is not None:
+        key = cache.get_key(map_from, map_to, rot_axes, rsmd_threshold, method)
+        transform = cache.get(key)
+        if transform is not None:
+            return transform
+
+    transform = align_positions(
         map_from.reference_positions,
         map_to.reference_positions,
         rot_axes,
         rsmd_threshold,
+        method,
     )
+    if cache is not None:
+        cache.put(key, transform)
+    return transform
+
+
+@dataclass
+class AlignmentResult:
+    """
+    AlignmentResult contains the outcome of aligning one pair of maps in
+    align_maps_batch. Either transform or error is set
+    """
+
+    name: str
+    transform: Optional[Transform]
+    error: Optional[ValueError]
+    duration: float
+
+
+def align_maps_batch(
+    map_alignments: Sequence[Union[MapAlignment, Tuple[Map, Map]]],
+    rot_axes: Literal["x", "y", "z", "xyz"],
+    rsmd_threshold=0.4,
+    method: Literal["edges", "centroid"] = "edges",
+    max_workers: Optional[int] = None,
+    use_processes: bool = True,
+) -> List[AlignmentResult]:
+    """
+    Uses align_maps to create transforms for many pairs of maps concurrently.
+    Failing alignments are returned as results with an error instead of raising.
+
+    :param map_alignments: MapAlignments or (map_from, map_to) tuples
+    :param rot_axes: Axis of rotation, see align_maps
+    :param rsmd_threshold: The root mean square distance threshold, see align_maps
+    :param method: Method used to find the rotation, see align_positions
+    :param max_workers: Number of workers, defaults to the number of processors.
+        With one worker the maps are aligned sequentially in the calling process
+    :param use_processes: Set to false to use a thread pool instead of a process
+        pool
+    :return: One AlignmentResult per map pair, in the same order as the input
+    """
+    names: List[str] = []
+    pairs: List[Tuple[Map, Map]] = []
+    for map_alignment in map_alignments:
+        if isinstance(map_alignment, MapAlignment):
+            names.append(map_alignment.name)
+            pairs.append((map_alignment.map_from, map_alignment.map_to))
+        else:
+            map_from, map_to = map_alignment
+            names.append(f"{map_from.name} -> {map_to.name}")
+            pairs.append((map_from, map_to))
+
+    arguments = [
+        (map_from, map_to, rot_axes, rsmd_threshold, method)
+        for map_from, map_to in pairs
+    ]
+    if max_workers == 1 or len(pairs) <= 1:
+        outcomes = [_align_map_pair(*argument) for argument in arguments]
+    else:
+        executor: Executor
+        if use_processes:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        with executor:
+            outcomes = list(executor.map(_align_map_pair, *zip(*arguments)))
+
+    return [
+        AlignmentResult(name, transform, error, duration)
+        for name, (transform, error, duration) in zip(names, outcomes)
+    ]
+
 
+def _align_map_pair(
+    map_from: Map,
+    map_to: Map,
+    rot_axes: Literal["x", "y", "z", "xyz"],
+    rsmd_threshold: float,
+    method: Literal["edges", "centroid"],
+) -> Tuple[Optional[Transform], Optional[ValueError], float]:
+    start = time.perf_counter()
+    try:
+        transform = align_maps(map_from, map_to, rot_axes, rsmd_threshold, method)
+    except ValueError as e:
+        return None, e, time.perf_counter() - start
+    return transform, None, time.perf_counter() - start
 
+
+@instrumented("align_positions", "positions_from")
 def align_positions(
     positions_from: Positions,
     positions_to: Positions,
     rot_axes: Literal["x", "y", "z", "xyz"],
     rsmd_threshold=0.4,
+    method: Literal["edges", "centroid"] = "edges",
 ) -> Transform:
     """
     Let positions_from be fixed local coordinate frame, and positions_to be some other
@@ -58,29 +166,38 @@ def align_positions(
         this is set to 'z'
     :param rsmd_threshold: The root mean square distance threshold, for the coordinate
         fitting error in matching the two coordinate systems.
+    :param method: Method used to find the rotation. 'edges' matches the vectors
+        between all pairs of positions, which scales quadratically with the number
+        of positions. 'centroid' centers both sets of positions on their centroids
+        and finds the rotation from their cross-covariance (Kabsch), which scales
+        linearly with the number of positions.
     """
-    if len(positions_from.positions) != len(positions_to.positions):
-        raise ValueError(
-            f"Expected inputs 'positions_from' and 'positions_to' to have the same shapes"
-            + f" got {len(positions_from.positions)} and {len(positions_to.positions)}, respectively"
-        )
-    if len(positions_from.positions) < 2:
-        raise ValueError(
-            f" Expected at least 2 positions, got {len(positions_from.positions)}"
-        )
-    if len(positions_from.positions) < 3 and rot_axes == "xyz":
-        raise ValueError(
-            f" Expected at least 3 positions, got {len(positions_from.positions)}"
-        )
+    _check_positions(positions_from, positions_to, rot_axes)
 
-    try:
-        edges_1, edges_2 = _get_edges(positions_from, positions_to, rot_axes)
-    except Exception as e:
-        raise ValueError(e)
+    rotation: Rotation
+    if method == "edges":
+        try:
+            edges_1, edges_2 = _get_edges(positions_from, positions_to, rot_axes)
+        except Exception as e:
+            raise ValueError(e)
 
-    rotation, rmsd_rot, sensitivity = Rotation.align_vectors(
-        edges_2, edges_1, return_sensitivity=True
-    )
+        rotation, rmsd_rot, sensitivity = Rotation.align_vectors(
+            edges_2, edges_1, return_sensitivity=True
+        )
+    elif method == "centroid":
+        for positions in (positions_from, positions_to):
+            if _get_spread(positions.to_array(), rot_axes) < 10e-2:
+                raise ValueError("Positions are not unique")
+        rotation = Rotation.from_matrix(
+            _get_rotation_matrices(
+                _get_cross_covariance(
+                    positions_from.to_array(), positions_to.to_array()
+                )[np.newaxis],
+                rot_axes,
+            )[0]
+        )
+    else:
+        raise ValueError(f"Unknown alignment method {method}")
 
     translations: Translation = Translation.from_array(
         np.mean(
@@ -105,6 +222,225 @@ def align_positions(
     return transform
 
 
+def align_maps_ransac(
+    map_from: Map,
+    map_to: Map,
+    rot_axes: Literal["x", "y", "z", "xyz"],
+    rsmd_threshold=0.4,
+    inlier_threshold=0.4,
+    max_iterations: int = 1000,
+    seed: Optional[int] = None,
+    max_workers: int = 1,
+) -> Tuple[Transform, np.ndarray]:
+    """
+    Uses align_positions_ransac to create a transform between two maps.
+    See align_positions_ransac for further information.
+
+    :param map_from: Map the transform is coming from
+    :param map_to: Map the transform is going to
+    :return: Tuple of the transform and a boolean inlier mask for the reference
+        positions of the maps
+    """
+    return align_positions_ransac(
+        map_from.reference_positions,
+        map_to.reference_positions,
+        rot_axes,
+        rsmd_threshold,
+        inlier_threshold,
+        max_iterations,
+        seed,
+        max_workers,
+    )
+
+
+@instrumented("align_positions_ransac", "positions_from")
+def align_positions_ransac(
+    positions_from: Positions,
+    positions_to: Positions,
+    rot_axes: Literal["x", "y", "z", "xyz"],
+    rsmd_threshold=0.4,
+    inlier_threshold=0.4,
+    max_iterations: int = 1000,
+    seed: Optional[int] = None,
+    max_workers: int = 1,
+) -> Tuple[Transform, np.ndarray]:
+    """
+    Robust version of align_positions, for position pairs where some positions may
+    be misplaced. Candidate transforms are fitted to random minimal subsets of the
+    position pairs (2 pairs, or 3 for 'xyz') and scored against all pairs. The
+    transform is then refitted to the inliers of the best candidate.
+
+    :param positions_from: Coordinates in a fixed frame
+    :param positions_to: Coordinates in a fixed frame
+    :param rot_axes: Axis of rotation. For rotations in the xy plane (most common),
+        this is set to 'z'
+    :param rsmd_threshold: The root mean square distance threshold, for the coordinate
+        fitting error of the inliers in matching the two coordinate systems.
+    :param inlier_threshold: Maximum distance between a transformed position and its
+        pair for the pair to count as an inlier
+    :param max_iterations: Number of candidate transforms
+    :param seed: Seed for the random subsets, the result does not depend on
+        max_workers for a given seed
+    :param max_workers: Number of threads used to score the candidate transforms
+    :return: Tuple of the transform and a boolean inlier mask of shape (N,)
+    """
+    _check_positions(positions_from, positions_to, rot_axes)
+    positions_from_arr = positions_from.to_array()
+    positions_to_arr = positions_to.to_array()
+    n_positions = positions_from_arr.shape[0]
+    sample_size = 3 if rot_axes == "xyz" else 2
+
+    rng = np.random.default_rng(seed)
+    samples = np.argpartition(
+        rng.random((max_iterations, n_positions)), sample_size - 1, axis=1
+    )[:, :sample_size]
+    rotation_matrices, translations = _fit_samples(
+        positions_from_arr[samples], positions_to_arr[samples], rot_axes
+    )
+
+    chunks = [
+        slice(start, start + _RANSAC_CHUNK_SIZE)
+        for start in range(0, max_iterations, _RANSAC_CHUNK_SIZE)
+    ]
+
+    def score_chunk(chunk: slice) -> np.ndarray:
+        return _score_hypotheses(
+            rotation_matrices[chunk],
+            translations[chunk],
+            positions_from_arr,
+            positions_to_arr,
+            inlier_threshold,
+        )
+
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            scores = np.concatenate(list(executor.map(score_chunk, chunks)))
+    else:
+        scores = np.concatenate([score_chunk(chunk) for chunk in chunks])
+
+    best = int(np.argmin(scores))
+    inliers = _get_inliers(
+        rotation_matrices[best],
+        translations[best],
+        positions_from_arr,
+        positions_to_arr,
+        inlier_threshold,
+    )
+    _check_inlier_count(inliers, sample_size)
+
+    rotation_matrix, translation = _fit_samples(
+        positions_from_arr[inliers][np.newaxis],
+        positions_to_arr[inliers][np.newaxis],
+        rot_axes,
+    )
+    inliers = _get_inliers(
+        rotation_matrix[0],
+        translation[0],
+        positions_from_arr,
+        positions_to_arr,
+        inlier_threshold,
+    )
+    _check_inlier_count(inliers, sample_size)
+    transform = Transform(
+        from_=positions_from.frame,
+        to_=positions_to.frame,
+        translation=Translation.from_array(
+            translation[0], from_=positions_from.frame, to_=positions_to.frame
+        ),
+        rotation=Rotation.from_matrix(rotation_matrix[0]),
+    )
+
+    try:
+        _check_rsme_treshold(
+            transform,
+            Positions.from_array(positions_to_arr[inliers], positions_to.frame),
+            Positions.from_array(positions_from_arr[inliers], positions_from.frame),
+            rsmd_threshold,
+        )
+    except Exception as e:
+        raise ValueError(e)
+
+    return transform, inliers
+
+
+def _check_positions(
+    positions_from: Positions,
+    positions_to: Positions,
+    rot_axes: Literal["x", "y", "z", "xyz"],
+) -> None:
+    if len(positions_from) != len(positions_to):
+        raise ValueError(
+            f"Expected inputs 'positions_from' and 'positions_to' to have the same shapes"
+            + f" got {len(positions_from)} and {len(positions_to)}, respectively"
+        )
+    if len(positions_from) < 2:
+        raise ValueError(f" Expected at least 2 positions, got {len(positions_from)}")
+    if len(positions_from) < 3 and rot_axes == "xyz":
+        raise ValueError(f" Expected at least 3 positions, got {len(positions_from)}")
+
+
+def _check_inlier_count(inliers: np.ndarray, sample_size: int) -> None:
+    if np.count_nonzero(inliers) < sample_size:
+        raise ValueError(
+            f"Expected at least {sample_size} inliers, got {np.count_nonzero(inliers)}"
+        )
+
+
+def _fit_samples(
+    samples_from: np.ndarray,
+    samples_to: np.ndarray,
+    rot_axes: Literal["x", "y", "z", "xyz"],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fits one transform to each of K sets of position pairs of shape (K,M,3)
+    :return: Rotation matrices of shape (K,3,3) and translations of shape (K,3)
+    """
+    mean_from = np.mean(samples_from, axis=1)
+    mean_to = np.mean(samples_to, axis=1)
+    cross_covariances = np.einsum(
+        "kni,knj->kij",
+        samples_to - mean_to[:, np.newaxis],
+        samples_from - mean_from[:, np.newaxis],
+    )
+    rotation_matrices = _get_rotation_matrices(cross_covariances, rot_axes)
+    translations = mean_to - np.einsum("kij,kj->ki", rotation_matrices, mean_from)
+    return rotation_matrices, translations
+
+
+def _score_hypotheses(
+    rotation_matrices: np.ndarray,
+    translations: np.ndarray,
+    positions_from: np.ndarray,
+    positions_to: np.ndarray,
+    inlier_threshold: float,
+) -> np.ndarray:
+    """
+    Scores K transforms against all position pairs with the truncated squared
+    distance (MSAC), lower is better
+    :return: Scores of shape (K,)
+    """
+    residuals = (
+        np.einsum("kij,nj->kni", rotation_matrices, positions_from)
+        + translations[:, np.newaxis]
+        - positions_to
+    )
+    squared_distances = np.einsum("kni,kni->kn", residuals, residuals)
+    return np.sum(np.minimum(squared_distances, inlier_threshold**2), axis=1)
+
+
+def _get_inliers(
+    rotation_matrix: np.ndarray,
+    translation: np.ndarray,
+    positions_from: np.ndarray,
+    positions_to: np.ndarray,
+    inlier_threshold: float,
+) -> np.ndarray:
+    distances = norm(
+        positions_from @ rotation_matrix.T + translation - positions_to, axis=1
+    )
+    return distances < inlier_threshold
+
+
 def _get_edges(
     positions_from: Positions,
     positions_to: Positions,
@@ -113,53 +449,137 @@ def _get_edges(
 ) -> Tuple[np.ndarray, np.ndarray]:
     edges_from = _get_edges_between_coordinates(positions_from)
     edges_to = _get_edges_between_coordinates(positions_to)
-    if np.min(norm((np.vstack([edges_from, edges_to])), axis=1)) < tol:
+    if min(_get_min_edge_length(edges_from), _get_min_edge_length(edges_to)) < tol:
         raise ValueError("Positions are not unique")
     edges_from, edges_to = _add_dummy_rot_axis_edge(edges_from, edges_to, rot_axes)
     return edges_from, edges_to
 
 
-def _get_edges_between_coordinates(positions_from: Positions) -> np.ndarray:
-    """Finds all edges (vectors) between the input coordinates"""
+def _get_edges_between_coordinates(
+    positions_from: Positions, chunk_size: int = _EDGE_CHUNK_SIZE
+) -> np.ndarray:
+    """
+    Finds all edges (vectors) between the input coordinates, ordered as
+    (0,1), (0,2), ..., (0,N-1), (1,2), ... The edges are computed in chunks of
+    about chunk_size edges to bound the memory used by the index arrays
+    """
     positions_from_arr = positions_from.to_array()
     n_positions = positions_from_arr.shape[0]
-    edges = np.empty([sum(range(n_positions)), 3])
-    index = 0
-    for i in range(0, n_positions - 1):
-        for j in range(i + 1, n_positions):
-            edges[index, :] = np.array(
-                [
-                    positions_from_arr[i] - positions_from_arr[j],
-                ]
-            )
-            index = index + 1
+    edges = np.empty([n_positions * (n_positions - 1) // 2, 3])
+
+    edge_counts = np.arange(n_positions - 1, 0, -1)
+    edge_ends = np.cumsum(edge_counts)
+    row_start = 0
+    while row_start < n_positions - 1:
+        edge_start = edge_ends[row_start] - edge_counts[row_start]
+        row_end = max(
+            int(np.searchsorted(edge_ends, edge_start + chunk_size, side="right")),
+            row_start + 1,
+        )
+        row_counts = edge_counts[row_start:row_end]
+        rows = np.repeat(np.arange(row_start, row_end), row_counts)
+        row_offsets = np.repeat(edge_ends[row_start:row_end] - row_counts, row_counts)
+        columns = rows + 1 + np.arange(edge_start, edge_ends[row_end - 1]) - row_offsets
+        np.subtract(
+            positions_from_arr[rows],
+            positions_from_arr[columns],
+            out=edges[edge_start : edge_ends[row_end - 1]],
+        )
+        row_start = row_end
     return edges
 
 
+def _get_min_edge_length(
+    edges: np.ndarray, chunk_size: int = _EDGE_CHUNK_SIZE
+) -> float:
+    """Finds the length of the shortest edge, in chunks of chunk_size edges"""
+    min_squared_length = np.inf
+    for start in range(0, edges.shape[0], chunk_size):
+        chunk = edges[start : start + chunk_size]
+        min_squared_length = min(
+            min_squared_length, np.min(np.einsum("ij,ij->i", chunk, chunk))
+        )
+    return np.sqrt(min_squared_length)
+
+
 def _add_dummy_rot_axis_edge(
     edges_from: np.ndarray,
     edges_to: np.ndarray,
     rot_axes: Literal["x", "y", "z", "xyz"],
 ) -> Tuple[np.ndarray, np.ndarray]:
     """Adds vectors to help ensure no rotations about non specified axes"""
-    if rot_axes == "z":
-        edges_from[:, 2] = 0
-        edges_to[:, 2] = 0
-        edges_from = np.vstack([edges_from, np.array([[0, 0, 1]])])
-        edges_to = np.vstack([edges_to, np.array([[0, 0, 1]])])
-    if rot_axes == "y":
-        edges_from[:, 1] = 0
-        edges_to[:, 1] = 0
-        edges_from = np.vstack([edges_from, np.array([[0, 1, 0]])])
-        edges_to = np.vstack([edges_to, np.array([[0, 1, 0]])])
-    if rot_axes == "x":
-        edges_from[:, 0] = 0
-        edges_to[:, 0] = 0
-        edges_from = np.vstack([edges_from, np.array([[1, 0, 0]])])
-        edges_to = np.vstack([edges_to, np.array([[1, 0, 0]])])
-    return edges_from, edges_to
+    axis = _ROT_AXIS_INDEX.get(rot_axes)
+    if axis is None:
+        return edges_from, edges_to
+    rot_axis_edge = np.zeros([1, 3])
+    rot_axis_edge[0, axis] = 1
+    edges_from[:, axis] = 0
+    edges_to[:, axis] = 0
+    return (
+        np.concatenate([edges_from, rot_axis_edge]),
+        np.concatenate([edges_to, rot_axis_edge]),
+    )
+
+
+def _get_cross_covariance(
+    positions_from: np.ndarray, positions_to: np.ndarray
+) -> np.ndarray:
+    """Cross-covariance sum((to_i - to_mean) (from_i - from_mean)^T), shape (3,3)"""
+    return (positions_to - np.mean(positions_to, axis=0)).T @ (
+        positions_from - np.mean(positions_from, axis=0)
+    )
+
+
+def _get_spread(
+    positions: np.ndarray, rot_axes: Literal["x", "y", "z", "xyz"]
+) -> float:
+    """
+    Root mean square distance of the positions from their centroid, along the
+    direction with the least spread that is needed to determine the rotation. A
+    rotation about one axis needs spread along one direction in the plane normal to
+    the axis, a rotation about all axes needs spread along two directions
+    """
+    centered = positions - np.mean(positions, axis=0)
+    if rot_axes == "xyz":
+        rank = 2
+    else:
+        centered = np.delete(centered, _ROT_AXIS_INDEX[rot_axes], axis=1)
+        rank = 1
+    variances = np.linalg.eigvalsh(centered.T @ centered / positions.shape[0])
+    return float(np.sqrt(max(variances[-rank], 0.0)))
+
+
+def _get_rotation_matrices(
+    cross_covariances: np.ndarray, rot_axes: Literal["x", "y", "z", "xyz"]
+) -> np.ndarray:
+    """
+    Finds the rotation matrices R maximizing sum(to_i . R from_i) from a stack of
+    cross-covariances sum(to_i from_i^T) of shape (K,3,3). For a single rotation
+    axis the angle has a closed form, for 'xyz' it is found with the Kabsch SVD
+    """
+    axis = _ROT_AXIS_INDEX.get(rot_axes)
+    if axis is None:
+        u, _, vt = np.linalg.svd(cross_covariances)
+        reflection = np.linalg.det(u @ vt) < 0
+        u[reflection, :, 2] *= -1
+        return u @ vt
+
+    i, j = (axis + 1) % 3, (axis + 2) % 3
+    angles = np.arctan2(
+        cross_covariances[:, j, i] - cross_covariances[:, i, j],
+        cross_covariances[:, i, i] + cross_covariances[:, j, j],
+    )
+    cos, sin = np.cos(angles), np.sin(angles)
+    rotation_matrices = np.zeros(cross_covariances.shape)
+    rotation_matrices[:, axis, axis] = 1
+    rotation_matrices[:, i, i] = cos
+    rotation_matrices[:, j, j] = cos
+    rotation_matrices[:, i, j] = -sin
+    rotation_matrices[:, j, i] = sin
+    return rotation_matrices
 
 
+@instrumented("_check_rsme_treshold", "positions_from")
 def _check_rsme_treshold(
     transform: Transform,
     positions_to: Positions,
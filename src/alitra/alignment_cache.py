@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Literal, Optional
+
+import numpy as np
+
+from .models.frame import Frame
+from .models.map import Map
+from .models.translation import Translation
+from .transform import Transform
+
+_KEY_VERSION = b"alitra-alignment-cache-v1"
+
+
+class AlignmentCache:
+    """
+    A cache of transforms from align_maps, keyed by a hash of the reference
+    positions and frames of the two maps and the alignment parameters. Transforms
+    are kept in an in-memory LRU and, if a directory is given, stored as json files
+    so they are reused across processes and restarts.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_memory_entries: int = 128,
+        max_disk_bytes: int = 10 * 1024 * 1024,
+    ) -> None:
+        """
+        :param directory: Directory for the on-disk store, created if missing. No
+            transforms are stored on disk if not given
+        :param max_memory_entries: Number of transforms kept in memory
+        :param max_disk_bytes: Total size of the on-disk store, the least recently
+            used transforms are deleted when it is exceeded
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, Transform] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def get_key(
+        map_from: Map,
+        map_to: Map,
+        rot_axes: Literal["x", "y", "z", "xyz"],
+        rsmd_threshold: float,
+        method: str,
+    ) -> str:
+        """
+        :return: Stable hash of the inputs of align_maps
+        """
+        digest = hashlib.sha256(_KEY_VERSION)
+        for map_ in (map_from, map_to):
+            positions = map_.reference_positions
+            digest.update(positions.frame.name.encode())
+            digest.update(b"\0")
+            digest.update(np.asarray(positions.to_array(), dtype="<f8").tobytes())
+            digest.update(b"\0")
+        digest.update(f"{rot_axes}\0{float(rsmd_threshold)!r}\0{method}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Transform]:
+        """
+        :param key: Key from get_key
+        :return: The cached transform, or None if it is not cached
+        """
+        with self._lock:
+            transform = self._memory.get(key)
+            if transform is not None:
+                self._memory.move_to_end(key)
+                return transform
+
+        if self.directory is None:
+            return None
+        path = self.directory / f"{key}.json"
+        try:
+            with open(path) as json_file:
+                transform = _transform_from_dict(json.load(json_file))
+            os.utime(path)
+        except Exception:
+            # A missing or unreadable file is a cache miss
+            return None
+
+        self._put_memory(key, transform)
+        return transform
+
+    def put(self, key: str, transform: Transform) -> None:
+        """
+        :param key: Key from get_key
+        :param transform: Transform to cache
+        """
+        self._put_memory(key, transform)
+        if self.directory is None:
+            return
+
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        with os.fdopen(file_descriptor, "w") as json_file:
+            json.dump(_transform_to_dict(transform), json_file)
+        os.replace(temporary_path, self.directory / f"{key}.json")
+        self._evict_disk()
+
+    def clear(self) -> None:
+        """
+        Removes all transforms from memory and from the on-disk store
+        """
+        with self._lock:
+            self._memory.clear()
+        if self.directory is not None:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def _put_memory(self, key: str, transform: Transform) -> None:
+        with self._lock:
+            self._memory[key] = transform
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total_size = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda file: file[0]):
+            if total_size <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+
+def _transform_to_dict(transform: Transform) -> dict:
+    return {
+        "from_": transform.from_.name,
+        "to_": transform.to_.name,
+        "translation": transform.translation.to_array().tolist(),
+        "quaternion": transform.rotation.as_quat().tolist(),
+    }
+
+
+def _transform_from_dict(transform_dict: dict) -> Transform:
+    from_ = Frame(transform_dict["from_"])
+    to_ = Frame(transform_dict["to_"])
+    return Transform.from_quat_array(
+        translation=Translation.from_array(
+            np.array(transform_dict["translation"], dtype=float), from_=from_, to_=to_
+        ),
+        quat=np.array(transform_dict["quaternion"], dtype=float),
+        from_=from_,
+        to_=to_,
+    )
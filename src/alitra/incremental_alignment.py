@@ -0,0 +1,148 @@
+from typing import Dict, Literal, Optional, Tuple
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from .alignment import _check_rsme_treshold, _get_rotation_matrices
+from .models.frame import Frame
+from .models.position import Position, Positions
+from .models.translation import Translation
+from .transform import Transform
+
+
+class IncrementalAligner:
+    """
+    Aligns two frames from position pairs that arrive one at a time. The aligner
+    keeps running sums of the positions and of their cross products, so adding or
+    removing a pair updates the transform in constant time. The transform is the
+    same as align_positions with method='centroid' on all current pairs.
+    """
+
+    def __init__(
+        self,
+        from_: Frame,
+        to_: Frame,
+        rot_axes: Literal["x", "y", "z", "xyz"],
+        rsmd_threshold=0.4,
+    ) -> None:
+        """
+        :param from_: Frame of the positions the transform is coming from
+        :param to_: Frame of the positions the transform is going to
+        :param rot_axes: Axis of rotation. For rotations in the xy plane (most
+            common), this is set to 'z'
+        :param rsmd_threshold: The root mean square distance threshold used by
+            check_rsmd_threshold
+        """
+        self.from_ = from_
+        self.to_ = to_
+        self.rot_axes = rot_axes
+        self.rsmd_threshold = rsmd_threshold
+        self._pairs: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._next_key = 0
+        # The sums are taken relative to the first pair, to avoid losing precision
+        # when the coordinates are large
+        self._origin_from: Optional[np.ndarray] = None
+        self._origin_to: Optional[np.ndarray] = None
+        self._sum_from = np.zeros(3)
+        self._sum_to = np.zeros(3)
+        self._sum_products = np.zeros((3, 3))
+        self._transform: Optional[Transform] = None
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def add(self, position_from: Position, position_to: Position) -> int:
+        """
+        :param position_from: Position in the from_ frame
+        :param position_to: The same position in the to_ frame
+        :return: Key of the pair, used to remove it
+        """
+        if position_from.frame != self.from_ or position_to.frame != self.to_:
+            raise ValueError(
+                f"Expected positions in frames {self.from_} and {self.to_}, got "
+                + f"positions in frames {position_from.frame} and {position_to.frame}"
+            )
+        if self._origin_from is None:
+            self._origin_from = position_from.to_array()
+            self._origin_to = position_to.to_array()
+
+        array_from = position_from.to_array() - self._origin_from
+        array_to = position_to.to_array() - self._origin_to
+        self._update(array_from, array_to, 1)
+
+        key = self._next_key
+        self._next_key += 1
+        self._pairs[key] = (array_from, array_to)
+        return key
+
+    def remove(self, key: int) -> None:
+        """
+        :param key: Key returned by add for the pair to remove
+        """
+        pair = self._pairs.pop(key, None)
+        if pair is None:
+            raise ValueError(f"No position pair with key {key}")
+        self._update(*pair, -1)
+
+    @property
+    def transform(self) -> Transform:
+        """
+        :return: Transform from from_ to to_ fitted to the current pairs
+        """
+        if self._transform is not None:
+            return self._transform
+
+        count = len(self)
+        if count < 2:
+            raise ValueError(f" Expected at least 2 positions, got {count}")
+        if count < 3 and self.rot_axes == "xyz":
+            raise ValueError(f" Expected at least 3 positions, got {count}")
+
+        mean_from = self._sum_from / count
+        mean_to = self._sum_to / count
+        cross_covariance = self._sum_products - count * np.outer(mean_to, mean_from)
+        rotation_matrix = _get_rotation_matrices(
+            cross_covariance[np.newaxis], self.rot_axes
+        )[0]
+        translation = (
+            mean_to
+            + self._origin_to
+            - rotation_matrix @ (mean_from + self._origin_from)
+        )
+
+        self._transform = Transform(
+            translation=Translation.from_array(
+                translation, from_=self.from_, to_=self.to_
+            ),
+            from_=self.from_,
+            to_=self.to_,
+            rotation=Rotation.from_matrix(rotation_matrix),
+        )
+        return self._transform
+
+    def check_rsmd_threshold(self) -> float:
+        """
+        Checks the fitting error of the current transform over all current pairs,
+        the same check as done by align_positions. Takes time proportional to the
+        number of pairs.
+        :return: The rsmd_threshold, raises ValueError if it is exceeded
+        """
+        pairs = np.array(list(self._pairs.values())).reshape(-1, 2, 3)
+        positions_from = Positions.from_array(
+            pairs[:, 0] + self._origin_from, self.from_, copy=False
+        )
+        positions_to = Positions.from_array(
+            pairs[:, 1] + self._origin_to, self.to_, copy=False
+        )
+        try:
+            return _check_rsme_treshold(
+                self.transform, positions_to, positions_from, self.rsmd_threshold
+            )
+        except Exception as e:
+            raise ValueError(e)
+
+    def _update(self, array_from: np.ndarray, array_to: np.ndarray, sign: int) -> None:
+        self._sum_from += sign * array_from
+        self._sum_to += sign * array_to
+        self._sum_products += sign * np.outer(array_to, array_from)
+        self._transform = None
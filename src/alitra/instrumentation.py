@@ -0,0 +1,144 @@
+"""
+Opt-in timing of the main entry points of alitra. Listeners are called with the
+name of the function, the size of its input and the duration of the call in
+seconds. Without listeners the instrumented functions only check an empty tuple
+before being called.
+
+>>> statistics = CallStatistics()
+>>> with listening(statistics):
+...     transform.transform_position(positions, from_=robot_frame, to_=asset_frame)
+>>> statistics["Transform.transform_position"].mean_duration
+"""
+
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, ParamSpec, Tuple, TypeVar
+
+Listener = Callable[[str, int, float], None]
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_listeners: Tuple[Listener, ...] = ()
+_lock = threading.Lock()
+
+
+def add_listener(listener: Listener) -> None:
+    """
+    :param listener: Function called with the name, input size and duration in
+        seconds of every instrumented call
+    """
+    global _listeners
+    with _lock:
+        _listeners = _listeners + (listener,)
+
+
+def remove_listener(listener: Listener) -> None:
+    """
+    :param listener: Listener added with add_listener
+    """
+    global _listeners
+    with _lock:
+        if listener not in _listeners:
+            raise ValueError("The listener is not added")
+        index = _listeners.index(listener)
+        _listeners = _listeners[:index] + _listeners[index + 1 :]
+
+
+@contextmanager
+def listening(listener: Listener) -> Iterator[Listener]:
+    """
+    Adds a listener for the duration of a with-block
+    :param listener: See add_listener
+    """
+    add_listener(listener)
+    try:
+        yield listener
+    finally:
+        remove_listener(listener)
+
+
+@dataclass
+class CallStatistic:
+    """
+    Number of calls of an instrumented function, their total input size and their
+    durations in seconds
+    """
+
+    count: int = 0
+    total_size: int = 0
+    total_duration: float = 0.0
+    min_duration: float = float("inf")
+    max_duration: float = 0.0
+
+    @property
+    def mean_duration(self) -> float:
+        return self.total_duration / self.count if self.count > 0 else 0.0
+
+
+class CallStatistics(Dict[str, CallStatistic]):
+    """
+    Listener collecting a CallStatistic per instrumented function
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str, size: int, duration: float) -> None:
+        with self._lock:
+            statistic = self.get(name)
+            if statistic is None:
+                statistic = self[name] = CallStatistic()
+            statistic.count += 1
+            statistic.total_size += size
+            statistic.total_duration += duration
+            statistic.min_duration = min(statistic.min_duration, duration)
+            statistic.max_duration = max(statistic.max_duration, duration)
+
+
+def instrumented(
+    name: str, size_argument: str
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Decorator reporting the calls of a function to the listeners
+    :param name: Name the calls are reported with
+    :param size_argument: Name of the argument the input size is found from, as its
+        length or its number of rows
+    """
+
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        index = list(inspect.signature(function).parameters).index(size_argument)
+
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not _listeners:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                size = _get_size(
+                    args[index] if index < len(args) else kwargs.get(size_argument)
+                )
+                for listener in _listeners:
+                    listener(name, size, duration)
+
+        return wrapper
+
+    return decorator
+
+
+def _get_size(value: object) -> int:
+    shape = getattr(value, "shape", None)
+    if shape is not None:
+        return int(shape[0]) if len(shape) > 1 else 1
+    try:
+        return len(value)  # type: ignore
+    except TypeError:
+        return 1
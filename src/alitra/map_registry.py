@@ -0,0 +1,144 @@
+from typing import List, Optional, Union
+
+import numpy as np
+
+from .models.map import Map
+from .models.position import Position, Positions
+
+
+class MapRegistry:
+    """
+    A registry of maps with bounds, used to find the map covering a position. The
+    bounds are indexed in a uniform grid, so a query only checks the maps
+    overlapping the grid cell of each position instead of all maps. All bounds must
+    be in the same frame.
+    """
+
+    def __init__(self, maps: List[Map], max_cells: int = 2**20) -> None:
+        """
+        :param maps: Maps with bounds
+        :param max_cells: Maximum number of cells in the grid
+        """
+        if len(maps) == 0:
+            raise ValueError("Expected at least one map")
+        if any(map.bounds is None for map in maps):
+            raise ValueError("All maps in a MapRegistry must have bounds")
+        self.frame = maps[0].bounds.frame
+        if any(map.bounds.frame != self.frame for map in maps):
+            raise ValueError(f"Expected bounds of all maps in {self.frame} frame")
+
+        self.maps = list(maps)
+        self._min = np.array(
+            [[map.bounds.x_min, map.bounds.y_min, map.bounds.z_min] for map in maps],
+            dtype=float,
+        )
+        self._max = np.array(
+            [[map.bounds.x_max, map.bounds.y_max, map.bounds.z_max] for map in maps],
+            dtype=float,
+        )
+        self._build_grid(max_cells)
+
+    def __len__(self) -> int:
+        return len(self.maps)
+
+    def query(self, positions: Union[Positions, np.ndarray]) -> np.ndarray:
+        """
+        :param positions: Positions, or a numpy array of shape (N,3) assumed to be in
+            the frame of the registry
+        :return: Integer numpy array of shape (N,) with the index of the first map
+            whose bounds contain each position, or -1 if no map contains it
+        """
+        if isinstance(positions, Positions):
+            if positions.frame != self.frame:
+                raise ValueError(
+                    f"The positions are in {positions.frame} frame and the registry is in {self.frame} frame"
+                )
+            positions = positions.to_array()
+        if positions.ndim != 2 or positions.shape[1] != 3:
+            raise ValueError("positions should have shape (N,3)")
+
+        map_indices = np.full(positions.shape[0], -1, dtype=np.intp)
+        cell_indices = np.floor((positions - self._grid_origin) / self._cell_size)
+        in_grid = np.all(
+            (cell_indices >= 0) & (positions <= self._grid_end), axis=1
+        ) & np.all(np.isfinite(positions), axis=1)
+        points = np.flatnonzero(in_grid)
+        if points.shape[0] == 0:
+            return map_indices
+
+        cells = np.ravel_multi_index(
+            np.minimum(cell_indices[points].astype(np.intp), self._grid_shape - 1).T,
+            self._grid_shape,
+        )
+        starts = self._cell_starts[cells]
+        counts = self._cell_starts[cells + 1] - starts
+        for k in range(int(counts.max(initial=0))):
+            unresolved = (counts > k) & (map_indices[points] == -1)
+            candidate_points = points[unresolved]
+            candidates = self._cell_maps[starts[unresolved] + k]
+            candidate_positions = positions[candidate_points]
+            inside = np.all(
+                (candidate_positions >= self._min[candidates])
+                & (candidate_positions <= self._max[candidates]),
+                axis=1,
+            )
+            map_indices[candidate_points[inside]] = candidates[inside]
+        return map_indices
+
+    def get_map(self, position: Position) -> Optional[Map]:
+        """
+        :param position: Position in the frame of the registry
+        :return: The first map whose bounds contain the position, or None
+        """
+        if position.frame != self.frame:
+            raise ValueError(
+                f"The position is in {position.frame} frame and the registry is in {self.frame} frame"
+            )
+        index = self.query(position.to_array()[np.newaxis])[0]
+        return self.maps[index] if index >= 0 else None
+
+    def _build_grid(self, max_cells: int) -> None:
+        """
+        Builds the grid with cells about the size of the median map, and stores the
+        map indices overlapping each cell in compressed (CSR) form, sorted by map
+        index within each cell
+        """
+        self._grid_origin = self._min.min(axis=0)
+        self._grid_end = self._max.max(axis=0)
+        grid_extent = self._grid_end - self._grid_origin
+
+        cell_size = np.median(self._max - self._min, axis=0)
+        cell_size = np.where(cell_size > 0, cell_size, np.maximum(grid_extent, 1.0))
+        grid_shape = np.maximum(np.ceil(grid_extent / cell_size), 1)
+        if np.prod(grid_shape) > max_cells:
+            cell_size *= (np.prod(grid_shape) / max_cells) ** (1 / 3)
+            grid_shape = np.maximum(np.ceil(grid_extent / cell_size), 1)
+        self._cell_size = cell_size
+        self._grid_shape = grid_shape.astype(np.intp)
+
+        first_cells = self._cell_indices(self._min)
+        last_cells = self._cell_indices(self._max)
+        cell_ids: List[np.ndarray] = []
+        map_ids: List[np.ndarray] = []
+        for map_index, (first, last) in enumerate(zip(first_cells, last_cells)):
+            ranges = [np.arange(start, stop + 1) for start, stop in zip(first, last)]
+            cells = np.ravel_multi_index(
+                [axis.ravel() for axis in np.meshgrid(*ranges, indexing="ij")],
+                self._grid_shape,
+            )
+            cell_ids.append(cells)
+            map_ids.append(np.full(cells.shape[0], map_index, dtype=np.intp))
+
+        cell_ids_array = np.concatenate(cell_ids)
+        map_ids_array = np.concatenate(map_ids)
+        order = np.lexsort((map_ids_array, cell_ids_array))
+        self._cell_maps = map_ids_array[order]
+        self._cell_starts = np.zeros(int(np.prod(self._grid_shape)) + 1, dtype=np.intp)
+        np.cumsum(
+            np.bincount(cell_ids_array, minlength=int(np.prod(self._grid_shape))),
+            out=self._cell_starts[1:],
+        )
+
+    def _cell_indices(self, positions: np.ndarray) -> np.ndarray:
+        cell_indices = np.floor((positions - self._grid_origin) / self._cell_size)
+        return np.clip(cell_indices.astype(np.intp), 0, self._grid_shape - 1)
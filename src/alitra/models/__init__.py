@@ -1,7 +1,7 @@
 from .bounds import Bounds
 from .frame import Frame
 from .map import Map, MapAlignment
-from .orientation import Orientation
-from .pose import Pose
+from .orientation import Orientation, Orientations
+from .pose import Pose, PoseArray
 from .position import Position, Positions
 from .translation import Translation
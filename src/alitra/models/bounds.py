@@ -1,6 +1,9 @@
 from dataclasses import dataclass
+from typing import Union
 
-from .position import Position
+import numpy as np
+
+from .position import Position, Positions
 
 
 @dataclass
@@ -25,6 +28,8 @@ class Bounds:
         self.y_min = min(position.y for position in positions)
         self.z_max = max(position.z for position in positions)
         self.z_min = min(position.z for position in positions)
+        self._min_array = np.array([self.x_min, self.y_min, self.z_min], dtype=float)
+        self._max_array = np.array([self.x_max, self.y_max, self.z_max], dtype=float)
 
     def position_within_bounds(self, position: Position) -> bool:
         if not position.frame == self.frame:
@@ -38,3 +43,34 @@ class Bounds:
         if position.z < self.z_min or position.z > self.z_max:
             return False
         return True
+
+    def positions_within_bounds(
+        self, positions: Union[Positions, np.ndarray]
+    ) -> np.ndarray:
+        """
+        :param positions: Positions, or a numpy array of shape (N,3) assumed to be in
+            the frame of the bounds
+        :return: Boolean numpy array of shape (N,), true for positions within bounds
+        """
+        if isinstance(positions, Positions):
+            if not positions.frame == self.frame:
+                raise ValueError(
+                    f"The positions are in {positions.frame} frame and the bounds are in {self.frame} frame"
+                )
+            positions = positions.to_array()
+        if positions.ndim != 2 or positions.shape[1] != 3:
+            raise ValueError("positions should have shape (N,3)")
+        within_bounds = np.logical_and(
+            positions >= self._min_array, positions <= self._max_array
+        )
+        return np.all(within_bounds, axis=1)
+
+    def filter_positions(self, positions: Positions) -> Positions:
+        """
+        :param positions: Positions in the frame of the bounds
+        :return: The positions within bounds
+        """
+        mask = self.positions_within_bounds(positions)
+        return Positions.from_array(
+            positions.to_array()[mask], positions.frame, copy=False
+        )
@@ -1,13 +1,39 @@
 from __future__ import annotations
 
+import threading
+import weakref
 from dataclasses import dataclass
+from typing import ClassVar
 
 
-@dataclass
+@dataclass(frozen=True, eq=False)
 class Frame:
     """
     Frame is used by most of our models to describe in which frame a model lives,
     or the two frames a transform is between.
+
+    Frames are interned, there is a single Frame object per name. Frames are
+    therefore compared by identity and can be used as dictionary keys.
     """
 
     name: str
+
+    _instances: ClassVar[weakref.WeakValueDictionary] = weakref.WeakValueDictionary()
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __new__(cls, name: str) -> Frame:
+        frame = cls._instances.get(name)
+        if frame is None:
+            with cls._lock:
+                frame = cls._instances.get(name)
+                if frame is None:
+                    frame = super().__new__(cls)
+                    object.__setattr__(frame, "name", name)
+                    cls._instances[name] = frame
+        return frame
+
+    def __reduce__(self):
+        """
+        Frames are recreated by name when unpickled or copied, so they stay interned
+        """
+        return Frame, (self.name,)
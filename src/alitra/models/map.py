@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import List, Optional
 
+import numpy as np
 from dacite import from_dict
 
 from .bounds import Bounds
 from .frame import Frame
-from .position import Positions
+from .position import Position, Positions
+
+_BINARY_POSITIONS_FILE = "reference_positions.npy"
+_BINARY_METADATA_FILE = "metadata.json"
 
 
 @dataclass
@@ -24,15 +30,133 @@ class Map:
     bounds: Bounds = None
 
     @staticmethod
-    def from_config(map_config_path: Path) -> Map:
+    def from_config(map_config_path: Path, use_dacite: bool = True) -> Map:
         """
-        Loads a Map from a json-file using dacite
+        Loads a Map from a json-file using dacite, or using Map.from_dict if
+        use_dacite is false
         """
         with open(map_config_path) as json_file:
             map_config_dict = json.load(json_file)
 
+        if not use_dacite:
+            return Map.from_dict(map_config_dict)
         return from_dict(data_class=Map, data=map_config_dict)
 
+    @staticmethod
+    def from_dict(map_dict: dict) -> Map:
+        """
+        Creates a Map from a dictionary with the same layout as the json-files.
+        The reference positions are read directly into the array of Positions,
+        which is much faster than dacite for maps with many positions
+        """
+        try:
+            reference_positions_dict = map_dict["reference_positions"]
+            reference_frame = _frame_from_dict(reference_positions_dict["frame"])
+            position_array = np.array(
+                [
+                    [position["x"], position["y"], position["z"]]
+                    for position in reference_positions_dict["positions"]
+                ],
+                dtype=float,
+            ).reshape(-1, 3)
+            bounds_dict = map_dict.get("bounds")
+            return Map(
+                name=str(map_dict["name"]),
+                frame=_frame_from_dict(map_dict["frame"]),
+                reference_positions=Positions.from_array(
+                    position_array, reference_frame, copy=False
+                ),
+                bounds=(
+                    Bounds(
+                        _position_from_dict(bounds_dict["position1"]),
+                        _position_from_dict(bounds_dict["position2"]),
+                    )
+                    if bounds_dict is not None
+                    else None
+                ),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid map config, {type(e).__name__}: {e}")
+
+    @staticmethod
+    def from_config_directory(
+        map_config_directory: Path,
+        max_workers: Optional[int] = None,
+        use_dacite: bool = False,
+    ) -> List[Map]:
+        """
+        Loads all json-files in a directory as Maps, in parallel using a process
+        pool
+        :param map_config_directory: Directory containing map json-files
+        :param max_workers: Number of processes, defaults to the number of
+            processors
+        :param use_dacite: Set to true to load the maps using dacite
+        :return: List of Maps, sorted by file name
+        """
+        map_config_paths = sorted(Path(map_config_directory).glob("*.json"))
+        if max_workers == 1 or len(map_config_paths) <= 1:
+            return [Map.from_config(path, use_dacite) for path in map_config_paths]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    Map.from_config,
+                    map_config_paths,
+                    [use_dacite] * len(map_config_paths),
+                )
+            )
+
+    def to_binary(self, map_directory: Path) -> None:
+        """
+        Saves the Map in a binary format, as a directory containing the reference
+        positions as a numpy .npy-file and the other fields as a small json-file.
+        The reference positions can then be memory-mapped by Map.from_binary
+        :param map_directory: Directory to save the Map in, created if missing
+        """
+        map_directory = Path(map_directory)
+        map_directory.mkdir(parents=True, exist_ok=True)
+        np.save(
+            map_directory / _BINARY_POSITIONS_FILE,
+            np.asarray(self.reference_positions.to_array(), dtype=float),
+        )
+        metadata = {
+            "name": self.name,
+            "frame": {"name": self.frame.name},
+            "reference_positions": {
+                "frame": {"name": self.reference_positions.frame.name}
+            },
+        }
+        if self.bounds is not None:
+            metadata["bounds"] = {
+                "position1": _position_to_dict(self.bounds.position1),
+                "position2": _position_to_dict(self.bounds.position2),
+            }
+        with open(map_directory / _BINARY_METADATA_FILE, "w") as json_file:
+            json.dump(metadata, json_file)
+
+    @staticmethod
+    def from_binary(map_directory: Path, mmap_mode: Optional[str] = "r") -> Map:
+        """
+        Loads a Map saved by Map.to_binary. With memory-mapping the load time does
+        not depend on the number of reference positions, and processes loading the
+        same Map share the memory of the positions
+        :param map_directory: Directory the Map was saved in
+        :param mmap_mode: Memory-map mode passed to numpy.load, 'r' gives read-only
+            reference positions. Set to None to read the positions into memory
+        """
+        map_directory = Path(map_directory)
+        with open(map_directory / _BINARY_METADATA_FILE) as json_file:
+            map_dict = json.load(json_file)
+        map_dict["reference_positions"]["positions"] = []
+        map = Map.from_dict(map_dict)
+
+        position_array = np.load(
+            map_directory / _BINARY_POSITIONS_FILE, mmap_mode=mmap_mode
+        )
+        map.reference_positions = Positions.from_array(
+            position_array, map.reference_positions.frame, copy=False
+        )
+        return map
+
 
 @dataclass
 class MapAlignment:
@@ -45,11 +169,51 @@ class MapAlignment:
     map_to: Map
 
     @staticmethod
-    def from_config(map_config_path: Path) -> MapAlignment:
+    def from_config(map_config_path: Path, use_dacite: bool = True) -> MapAlignment:
         """
-        Loads a MapAlignment from a json-file using dacite
+        Loads a MapAlignment from a json-file using dacite, or using
+        MapAlignment.from_dict if use_dacite is false
         """
         with open(map_config_path) as json_file:
             map_config_dict = json.load(json_file)
 
+        if not use_dacite:
+            return MapAlignment.from_dict(map_config_dict)
         return from_dict(data_class=MapAlignment, data=map_config_dict)
+
+    @staticmethod
+    def from_dict(map_alignment_dict: dict) -> MapAlignment:
+        """
+        Creates a MapAlignment from a dictionary with the same layout as the
+        json-files, see Map.from_dict
+        """
+        try:
+            return MapAlignment(
+                name=str(map_alignment_dict["name"]),
+                map_from=Map.from_dict(map_alignment_dict["map_from"]),
+                map_to=Map.from_dict(map_alignment_dict["map_to"]),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid map alignment config, {type(e).__name__}: {e}")
+
+
+def _position_to_dict(position: Position) -> dict:
+    return {
+        "x": float(position.x),
+        "y": float(position.y),
+        "z": float(position.z),
+        "frame": {"name": position.frame.name},
+    }
+
+
+def _frame_from_dict(frame_dict: dict) -> Frame:
+    return Frame(name=str(frame_dict["name"]))
+
+
+def _position_from_dict(position_dict: dict) -> Position:
+    return Position(
+        x=position_dict["x"],
+        y=position_dict["y"],
+        z=position_dict["z"],
+        frame=_frame_from_dict(position_dict["frame"]),
+    )
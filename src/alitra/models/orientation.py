@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Iterator, Union
 
 import numpy as np
 from scipy.spatial.transform import Rotation
@@ -8,7 +9,7 @@ from scipy.spatial.transform import Rotation
 from .frame import Frame
 
 
-@dataclass
+@dataclass(slots=True)
 class Orientation:
     """
     This class represents an orientation using the quaternion values:
@@ -37,7 +38,7 @@ class Orientation:
 
         if wrap_angles:
             base = 360.0 if degrees else 2 * np.pi
-            euler = np.fromiter(map(lambda angle: (angle % base), euler), dtype=float)
+            euler = np.mod(euler, base)
 
         return euler
 
@@ -107,3 +108,108 @@ class Orientation:
             + str(self.w)
             + "]"
         )
+
+
+@dataclass(eq=False)
+class Orientations:
+    """
+    This class represents N orientations as an (N,4) array of quaternion values
+    [x,y,z,w], and a frame. Conversions are done for all orientations at once using
+    a single scipy rotation holding N rotations
+    """
+
+    quaternions: np.ndarray
+    frame: Frame
+
+    def __post_init__(self):
+        if self.quaternions.ndim != 2 or self.quaternions.shape[1] != 4:
+            raise ValueError("quaternions should have shape (N,4)")
+
+    def to_euler_array(
+        self, degrees: bool = False, wrap_angles: bool = False, seq: str = "ZYX"
+    ) -> np.ndarray:
+        """
+        :param degrees: Set to true to retrieve angles as degrees
+        :param wrap_angles: Set to true to get angles between 0 and 360 deg or
+            0 and two pi
+        :param seq: Sequence of axes for rotations, same as scipy rotation
+        :return: Numpy array of euler angles, shape (N,3)
+        """
+        euler = self.to_rotation().as_euler(seq=seq, degrees=degrees)
+
+        if wrap_angles:
+            base = 360.0 if degrees else 2 * np.pi
+            euler = np.mod(euler, base, out=euler)
+
+        return euler
+
+    def to_quat_array(self) -> np.ndarray:
+        """
+        :return: Numpy array of quaternion values [x,y,z,w], shape (N,4)
+        """
+        return self.quaternions
+
+    def to_rotation(self) -> Rotation:
+        """
+        :return: Scipy Rotation object holding the N rotations
+        """
+        return Rotation.from_quat(self.quaternions)
+
+    @staticmethod
+    def from_quat_array(quat: np.ndarray, frame: Frame) -> Orientations:
+        """
+        :param quat: Numpy array of shape (N,4) containing quaternion values,
+            [[x,y,z,w],[x,y,z,w]]
+        :param frame: Frame of orientations
+        :return: Orientations object
+        """
+        return Orientations(np.array(quat, dtype=float, order="C"), frame=frame)
+
+    @staticmethod
+    def from_euler_array(
+        euler: np.ndarray, frame: Frame, degrees: bool = False, seq: str = "ZYX"
+    ) -> Orientations:
+        """
+        :param euler: Numpy array of euler angles of shape (N,3)
+        :param frame: Frame of orientations
+        :param degrees: Set to true if the angles are given in degrees
+        :param seq: Sequence of axes for rotations, same as scipy rotation
+        :return: Orientations object
+        """
+        if euler.ndim != 2 or euler.shape[1] != 3:
+            raise ValueError("euler should have shape (N,3)")
+        rotation = Rotation.from_euler(seq=seq, angles=euler, degrees=degrees)
+        return Orientations(rotation.as_quat(), frame=frame)
+
+    @staticmethod
+    def from_rotation(rotation: Rotation, frame: Frame) -> Orientations:
+        """
+        :param rotation: Scipy Rotation object holding N rotations
+        :param frame: Frame of orientations
+        :return: Orientations object
+        """
+        return Orientations(rotation.as_quat().reshape(-1, 4), frame=frame)
+
+    def __len__(self) -> int:
+        return self.quaternions.shape[0]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Orientation, Orientations]:
+        """
+        :param index: Integer index or slice
+        :return: Orientation for an integer index, Orientations sharing the same
+            underlying array for a slice
+        """
+        if isinstance(index, slice):
+            return Orientations(self.quaternions[index], frame=self.frame)
+        return Orientation.from_quat_array(self.quaternions[index], self.frame)
+
+    def __iter__(self) -> Iterator[Orientation]:
+        for quat in self.quaternions:
+            yield Orientation(*quat, frame=self.frame)  # type: ignore
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Orientations):
+            return NotImplemented
+        return self.frame == other.frame and np.array_equal(
+            self.quaternions, other.quaternions
+        )
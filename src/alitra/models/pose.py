@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Iterator, List, Tuple
 
 import numpy as np
+from scipy.spatial.transform import Rotation
 
 from .frame import Frame
-from .orientation import Orientation
-from .position import Position
+from .orientation import Orientation, Orientations
+from .position import Position, Positions
 
 
-@dataclass
+@dataclass(slots=True)
 class Pose:
     """
     Pose contains a position, an orientation and a frame
@@ -47,3 +48,95 @@ class Pose:
         :return: Unique string representation of the pose
         """
         return "pos:" + str(self.position) + ", ori: " + str(self.orientation)
+
+
+@dataclass(eq=False)
+class PoseArray:
+    """
+    PoseArray contains N positions, N orientations as quaternions and a frame. It is
+    used to transform many poses, such as a trajectory, in one operation
+    """
+
+    positions: Positions
+    quaternions: np.ndarray
+    frame: Frame
+
+    def __post_init__(self):
+        if self.quaternions.ndim != 2 or self.quaternions.shape[1] != 4:
+            raise ValueError("quaternions should have shape (N,4)")
+        if self.quaternions.shape[0] != len(self.positions):
+            raise ValueError(
+                f"Expected the same number of positions and quaternions, got "
+                + f"{len(self.positions)} and {self.quaternions.shape[0]}, respectively"
+            )
+        if self.positions.frame != self.frame:
+            raise ValueError(
+                f"The positions are in {self.positions.frame} frame and the poses are "
+                + f"in {self.frame} frame"
+            )
+
+    def to_array(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: Tuple of numpy arrays of the positions and orientations as
+            quaternions with shapes (N,3) and (N,4) respectively
+        """
+        return self.positions.to_array(), self.quaternions
+
+    @property
+    def orientations(self) -> Orientations:
+        """
+        :return: Orientations sharing the quaternion array of the poses
+        """
+        return Orientations(self.quaternions, self.frame)
+
+    def to_rotation(self) -> Rotation:
+        """
+        :return: Scipy Rotation object holding the N orientations
+        """
+        return Rotation.from_quat(self.quaternions)
+
+    @staticmethod
+    def from_array(
+        pos_array: np.ndarray, quat_array: np.ndarray, frame: Frame
+    ) -> PoseArray:
+        """
+        :param pos_array: Numpy array of shape (N,3) containing positions [x,y,z]
+        :param quat_array: Numpy array of shape (N,4) containing orientations as
+            quaternions [x,y,z,w]
+        :param frame: Frame of poses
+        :return: PoseArray object
+        """
+        return PoseArray(
+            Positions.from_array(pos_array, frame),
+            np.array(quat_array, dtype=float, order="C"),
+            frame,
+        )
+
+    @staticmethod
+    def from_poses(poses: List[Pose], frame: Frame) -> PoseArray:
+        """
+        :param poses: List of Pose objects, all in the given frame
+        :param frame: Frame of poses
+        :return: PoseArray object
+        """
+        if any(pose.frame != frame for pose in poses):
+            raise ValueError(f"All poses must be in {frame} frame")
+        return PoseArray.from_array(
+            np.array([pose.position.to_array() for pose in poses]).reshape(-1, 3),
+            np.array([pose.orientation.to_quat_array() for pose in poses]).reshape(
+                -1, 4
+            ),
+            frame,
+        )
+
+    def __len__(self) -> int:
+        return self.quaternions.shape[0]
+
+    def __getitem__(self, index: int) -> Pose:
+        return Pose.from_array(
+            self.positions.to_array()[index], self.quaternions[index], self.frame
+        )
+
+    def __iter__(self) -> Iterator[Pose]:
+        for index in range(len(self)):
+            yield self[index]
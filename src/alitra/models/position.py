@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import InitVar, dataclass
+from typing import Iterator, List, Optional, Tuple, Union
 
 import numpy as np
+import numpy.typing as npt
 
+from ..instrumentation import instrumented
 from .frame import Frame
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """
     Position contains the x, y and z coordinate as well as a frame
@@ -19,11 +21,12 @@ class Position:
     z: float
     frame: Frame
 
-    def to_array(self) -> np.ndarray:
+    def to_array(self, dtype: npt.DTypeLike = float) -> np.ndarray:
         """
+        :param dtype: Data type of the array
         :return: Numpy array of position, shape (3,)
         """
-        return np.array([self.x, self.y, self.z], dtype=float)
+        return np.array([self.x, self.y, self.z], dtype=dtype)
 
     @staticmethod
     def from_array(position: np.ndarray, frame: Frame) -> Position:
@@ -37,43 +40,142 @@ class Position:
         return Position(x=position[0], y=position[1], z=position[2], frame=frame)
 
 
-@dataclass
+@dataclass(init=False, eq=False, repr=False)
 class Positions:
     """
     Positions contains a list of positions as well as a frame in which the points
-    are valid
+    are valid. The coordinates are stored in a single contiguous (N,3) array, and
+    Position objects are only created when the positions are indexed or iterated.
+
+    The positions attribute is therefore a tuple of copies, created on each access.
+    Changing one of these Position objects does not change the Positions, assign
+    a new list to positions or modify the array from to_array instead.
     """
 
-    positions: List[Position]
+    positions: InitVar[List[Position]]
     frame: Frame
 
-    def to_array(self) -> np.ndarray:
+    def __init__(self, positions: List[Position], frame: Frame) -> None:
+        self._array: np.ndarray = _positions_to_array(positions)
+        self.frame = frame
+
+    @property
+    def positions(self) -> Tuple[Position, ...]:
         """
-        :return: Numpy array of positions, shape (N,3)
+        :return: Tuple of Position objects, created from the underlying array
         """
-        positions = []
-        for position in self.positions:
-            positions.append([position.x, position.y, position.z])
-        return np.array(positions, dtype=float)
+        return tuple(self)
+
+    @positions.setter
+    def positions(self, positions: List[Position]) -> None:
+        """
+        :param positions: Position objects replacing the underlying array
+        """
+        self._array = _positions_to_array(positions)
+
+    def to_array(self, dtype: Optional[npt.DTypeLike] = None) -> np.ndarray:
+        """
+        :param dtype: Data type of the array, defaults to the data type of the
+            underlying storage
+        :return: Numpy array of positions, shape (N,3). The array is the underlying
+            storage of the Positions and is not copied, unless a different dtype is
+            given
+        """
+        if dtype is None:
+            return self._array
+        return self._array.astype(dtype, copy=False)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        :return: Data type of the underlying storage
+        """
+        return self._array.dtype
 
     @staticmethod
-    def from_array(position_array: np.ndarray, frame: Frame) -> Positions:
+    @instrumented("Positions.from_array", "position_array")
+    def from_array(
+        position_array: np.ndarray,
+        frame: Frame,
+        copy: bool = True,
+        check_finite: bool = False,
+        dtype: Optional[npt.DTypeLike] = None,
+    ) -> Positions:
         """
         :param position_array: Numpy array of positions i.e. [[x,y,z],[x,y,z]].
             Needs to be shape (N,3)
         :param frame: Frame of positions
+        :param copy: Set to false to use the input array as storage when it already
+            is a contiguous array of the requested dtype, instead of copying it
+        :param check_finite: Set to true to raise if the array contains NaN or inf
+        :param dtype: Floating point data type of the storage. Defaults to the data
+            type of position_array if it is floating point, otherwise float64
         """
-        if len(position_array.shape) < 2 or position_array.shape[1] != 3:
+        if position_array.ndim != 2 or position_array.shape[1] != 3:
             raise ValueError("position_array should have shape (N,3)")
-        positions: List[Position] = []
-        for position in position_array:
-            positions.append(
-                Position(x=position[0], y=position[1], z=position[2], frame=frame)
-            )
-        return Positions(positions=positions, frame=frame)
+        if dtype is None:
+            dtype = _get_float_dtype(position_array)
+        elif not np.issubdtype(dtype, np.floating):
+            raise ValueError(f"dtype should be a floating point type, got {dtype}")
+        if copy:
+            buffer = np.array(position_array, dtype=dtype, order="C")
+        else:
+            buffer = np.ascontiguousarray(position_array, dtype=dtype)
+        if check_finite and not np.isfinite(buffer).all():
+            raise ValueError("position_array should only contain finite values")
+        return Positions._from_buffer(buffer, frame)
+
+    @staticmethod
+    def _from_buffer(buffer: np.ndarray, frame: Frame) -> Positions:
+        positions: Positions = Positions.__new__(Positions)
+        positions._array = buffer
+        positions.frame = frame
+        return positions
+
+    def __len__(self) -> int:
+        return self._array.shape[0]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Position, Positions]:
+        """
+        :param index: Integer index or slice
+        :return: Position for an integer index, Positions sharing the same
+            underlying array for a slice
+        """
+        if isinstance(index, slice):
+            return Positions._from_buffer(self._array[index], self.frame)
+        return Position.from_array(self._array[index], self.frame)
+
+    def __iter__(self) -> Iterator[Position]:
+        frame = self.frame
+        for x, y, z in self._array.tolist():
+            yield Position(x, y, z, frame)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Positions):
+            return NotImplemented
+        return self.frame == other.frame and np.array_equal(self._array, other._array)
+
+    def __repr__(self) -> str:
+        return f"Positions(positions={self._array!r}, frame={self.frame!r})"
 
     def __str__(self):
         """
         :return: Unique string representation of the position, ignoring the frame
         """
         return "(" + str(self.x) + "," + str(self.y) + "," + str(self.z) + ")"
+
+
+def _positions_to_array(positions: List[Position]) -> np.ndarray:
+    return np.array(
+        [[position.x, position.y, position.z] for position in positions],
+        dtype=float,
+    ).reshape(-1, 3)
+
+
+def _get_float_dtype(array: np.ndarray) -> np.dtype:
+    """
+    :return: The data type of array if it is floating point, otherwise float64
+    """
+    if np.issubdtype(array.dtype, np.floating):
+        return array.dtype
+    return np.dtype(float)
@@ -3,11 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 import numpy as np
+import numpy.typing as npt
 
 from alitra.models import Frame
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Translation:
     """
     A translation between two frames represented as x, y and z
@@ -19,11 +20,12 @@ class Translation:
     to_: Frame
     z: float = 0
 
-    def to_array(self) -> np.ndarray:
+    def to_array(self, dtype: npt.DTypeLike = float) -> np.ndarray:
         """
+        :param dtype: Data type of the array
         :return: Numpy array of translation, shape (3,)
         """
-        return np.array([self.x, self.y, self.z], dtype=float)
+        return np.array([self.x, self.y, self.z], dtype=dtype)
 
     @staticmethod
     def from_array(
@@ -0,0 +1,519 @@
+import asyncio
+import itertools
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from .models.frame import Frame
+from .transform_tree import TransformTree
+
+# Size in bytes of a pose in a json message, used to size the line limit of streams
+_BYTES_PER_POSITION = 256
+_ID_PATTERN = re.compile(rb'\s*\{\s*"id"\s*:\s*(\d+)')
+
+
+@dataclass
+class ServiceStatistics:
+    """
+    Number of requests, batches and positions transformed by a TransformService, the
+    time spent transforming them and the latency of the requests, from when they
+    were received until their result was ready
+    """
+
+    n_requests: int = 0
+    n_batches: int = 0
+    n_positions: int = 0
+    duration: float = 0.0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.n_requests / self.n_batches if self.n_batches > 0 else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.n_requests if self.n_requests > 0 else 0.0
+
+    @property
+    def positions_per_second(self) -> float:
+        return self.n_positions / self.duration if self.duration > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "n_requests": self.n_requests,
+            "n_batches": self.n_batches,
+            "n_positions": self.n_positions,
+            "duration": self.duration,
+            "total_latency": self.total_latency,
+            "max_latency": self.max_latency,
+            "mean_batch_size": self.mean_batch_size,
+            "mean_latency": self.mean_latency,
+            "positions_per_second": self.positions_per_second,
+        }
+
+
+@dataclass
+class _Request:
+    from_: Frame
+    to_: Frame
+    positions: np.ndarray
+    quaternions: Optional[np.ndarray]
+    future: asyncio.Future
+    received: float = field(default_factory=time.perf_counter)
+
+
+class TransformService:
+    """
+    Transforms positions and poses from many concurrent callers in batches. Requests
+    received within max_latency of the first request of a batch, up to
+    max_batch_size positions, are transformed together with one vectorized call per
+    pair of frames, using the transforms of a TransformTree.
+
+    The service is used in-process with transform_positions and transform_poses,
+    or over a TCP or Unix socket with TransformClient, using one json object per
+    line. Lines longer than stream_limit bytes are answered with an error.
+    """
+
+    def __init__(
+        self,
+        transform_tree: TransformTree,
+        max_batch_size: int = 4096,
+        max_latency: float = 0.002,
+    ) -> None:
+        """
+        :param transform_tree: Transforms between the frames of the requests
+        :param max_batch_size: Number of positions after which a batch is
+            transformed without waiting for more requests
+        :param max_latency: Time in seconds to wait for more requests after the
+            first request of a batch
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size should be at least 1")
+        self.transform_tree = transform_tree
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.stream_limit = max(2**16, max_batch_size * _BYTES_PER_POSITION)
+        self.statistics = ServiceStatistics()
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """
+        Starts collecting requests into batches
+        """
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._batcher = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """
+        Stops the service, requests that are not transformed yet are cancelled
+        """
+        if self._batcher is None:
+            return
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            self._queue.get_nowait().future.cancel()
+        self._batcher = None
+        self._queue = None
+
+    async def __aenter__(self) -> "TransformService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def transform_positions(
+        self, positions: np.ndarray, from_: Frame, to_: Frame
+    ) -> np.ndarray:
+        """
+        :param positions: Numpy array of positions in from_, shape (N,3)
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :return: Numpy array of positions in to_, shape (N,3)
+        """
+        result, _ = await self._submit(positions, None, from_, to_)
+        return result
+
+    async def transform_poses(
+        self,
+        positions: np.ndarray,
+        quaternions: np.ndarray,
+        from_: Frame,
+        to_: Frame,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param positions: Numpy array of positions in from_, shape (N,3)
+        :param quaternions: Numpy array of quaternions [x,y,z,w] in from_, shape
+            (N,4)
+        :param from_: Source Frame
+        :param to_: Destination Frame
+        :return: Tuple of numpy arrays of the positions and quaternions in to_
+        """
+        quaternions = np.asarray(quaternions, dtype=float).reshape(-1, 4)
+        return await self._submit(positions, quaternions, from_, to_)
+
+    async def start_tcp_server(
+        self, host: str = "127.0.0.1", port: int = 0
+    ) -> asyncio.AbstractServer:
+        """
+        :param host: Host to listen on
+        :param port: Port to listen on, a free port is used if 0
+        :return: Asyncio server, the port is found from its sockets
+        """
+        await self.start()
+        return await asyncio.start_server(
+            self._handle_connection, host, port, limit=self.stream_limit
+        )
+
+    async def start_unix_server(self, path: Path) -> asyncio.AbstractServer:
+        """
+        :param path: Path of the Unix socket
+        :return: Asyncio server
+        """
+        await self.start()
+        return await asyncio.start_unix_server(
+            self._handle_connection, str(path), limit=self.stream_limit
+        )
+
+    async def _submit(
+        self,
+        positions: np.ndarray,
+        quaternions: Optional[np.ndarray],
+        from_: Frame,
+        to_: Frame,
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if self._batcher is None:
+            raise RuntimeError("The service is not started")
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if quaternions is not None and quaternions.shape[0] != positions.shape[0]:
+            raise ValueError("Expected as many quaternions as positions")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Request(from_, to_, positions, quaternions, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[_Request] = [await self._queue.get()]
+            try:
+                await self._collect(batch, loop.time() + self.max_latency)
+            except asyncio.CancelledError:
+                # close only cancels the requests that are still on the queue
+                for request in batch:
+                    request.future.cancel()
+                raise
+            self._process(batch)
+
+    async def _collect(self, batch: List[_Request], deadline: float) -> None:
+        loop = asyncio.get_running_loop()
+        size = sum(request.positions.shape[0] for request in batch)
+        while size < self.max_batch_size:
+            try:
+                request = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    return
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    return
+            batch.append(request)
+            size += request.positions.shape[0]
+
+    def _process(self, batch: List[_Request]) -> None:
+        start = time.perf_counter()
+        groups: Dict[Tuple[Frame, Frame], List[_Request]] = {}
+        for request in batch:
+            if not request.future.cancelled():
+                groups.setdefault((request.from_, request.to_), []).append(request)
+
+        for (from_, to_), requests in groups.items():
+            try:
+                results = self._transform_group(requests, from_, to_)
+            except Exception as error:
+                # Errors fail the requests of the group, not the batcher
+                for request in requests:
+                    request.future.set_exception(error)
+                continue
+            for request, result in zip(requests, results):
+                request.future.set_result(result)
+
+        end = time.perf_counter()
+        statistics = self.statistics
+        statistics.duration += end - start
+        statistics.n_batches += 1
+        for request in batch:
+            latency = end - request.received
+            statistics.n_requests += 1
+            statistics.n_positions += request.positions.shape[0]
+            statistics.total_latency += latency
+            statistics.max_latency = max(statistics.max_latency, latency)
+
+    def _transform_group(
+        self, requests: List[_Request], from_: Frame, to_: Frame
+    ) -> List[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        transform = self.transform_tree.get_transform(from_, to_)
+        sizes = [request.positions.shape[0] for request in requests]
+        splits = np.cumsum(sizes)[:-1]
+        positions = transform.transform_array(
+            np.concatenate([request.positions for request in requests]), from_, to_
+        )
+        positions_split = np.split(positions, splits)
+
+        quaternions_split: List[Optional[np.ndarray]] = [None] * len(requests)
+        pose_indices = [
+            index
+            for index, request in enumerate(requests)
+            if request.quaternions is not None and request.quaternions.shape[0] > 0
+        ]
+        if pose_indices:
+            rotations = transform.transform_rotation(
+                Rotation.from_quat(
+                    np.concatenate(
+                        [requests[index].quaternions for index in pose_indices]
+                    )
+                ),
+                from_,
+                to_,
+            )
+            quaternions = np.split(
+                rotations.as_quat(),
+                np.cumsum([sizes[index] for index in pose_indices])[:-1],
+            )
+            for index, quaternion in zip(pose_indices, quaternions):
+                quaternions_split[index] = quaternion
+        for index, request in enumerate(requests):
+            if request.quaternions is not None and quaternions_split[index] is None:
+                quaternions_split[index] = np.empty((0, 4))
+
+        return list(zip(positions_split, quaternions_split))
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        tasks = set()
+        try:
+            while True:
+                line, skipped = await _read_line(reader)
+                if skipped:
+                    # The id is read from the start of the line to answer the request
+                    response = {
+                        "id": _get_message_id(line),
+                        "error": f"Message exceeds the limit of {self.stream_limit} "
+                        + "bytes",
+                    }
+                    writer.write(json.dumps(response).encode() + b"\n")
+                    continue
+                if not line:
+                    break
+                task = asyncio.create_task(self._handle_message(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _handle_message(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        response: dict = {}
+        try:
+            message = json.loads(line)
+            response["id"] = message.get("id")
+            if message.get("statistics"):
+                response["statistics"] = self.statistics.to_dict()
+            else:
+                from_, to_ = Frame(message["from_"]), Frame(message["to_"])
+                positions = np.array(message["positions"], dtype=float)
+                if "quaternions" in message:
+                    positions, quaternions = await self.transform_poses(
+                        positions, np.array(message["quaternions"]), from_, to_
+                    )
+                    response["quaternions"] = quaternions.tolist()
+                else:
+                    positions = await self.transform_positions(positions, from_, to_)
+                response["positions"] = positions.tolist()
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            # Errors are sent to the client instead of closing the connection
+            response["error"] = str(error) or type(error).__name__
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+
+class TransformClient:
+    """
+    Client for a TransformService listening on a TCP or Unix socket. Requests can be
+    sent concurrently over the same connection
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @staticmethod
+    async def connect_tcp(
+        host: str, port: int, limit: int = 4096 * _BYTES_PER_POSITION
+    ) -> "TransformClient":
+        """
+        :param host: Host of the service
+        :param port: Port of the service
+        :param limit: Maximum size in bytes of a response, should be at least the
+            stream_limit of the service
+        """
+        reader, writer = await asyncio.open_connection(host, port, limit=limit)
+        return TransformClient(reader, writer)
+
+    @staticmethod
+    async def connect_unix(
+        path: Path, limit: int = 4096 * _BYTES_PER_POSITION
+    ) -> "TransformClient":
+        """
+        :param path: Path of the Unix socket of the service
+        :param limit: Maximum size in bytes of a response, should be at least the
+            stream_limit of the service
+        """
+        reader, writer = await asyncio.open_unix_connection(str(path), limit=limit)
+        return TransformClient(reader, writer)
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except asyncio.CancelledError:
+            pass
+
+    async def __aenter__(self) -> "TransformClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def transform_positions(
+        self, positions: np.ndarray, from_: Frame, to_: Frame
+    ) -> np.ndarray:
+        """
+        See TransformService.transform_positions
+        """
+        response = await self._request(
+            {
+                "from_": from_.name,
+                "to_": to_.name,
+                "positions": np.asarray(positions, dtype=float).tolist(),
+            }
+        )
+        return np.array(response["positions"], dtype=float).reshape(-1, 3)
+
+    async def transform_poses(
+        self,
+        positions: np.ndarray,
+        quaternions: np.ndarray,
+        from_: Frame,
+        to_: Frame,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        See TransformService.transform_poses
+        """
+        response = await self._request(
+            {
+                "from_": from_.name,
+                "to_": to_.name,
+                "positions": np.asarray(positions, dtype=float).tolist(),
+                "quaternions": np.asarray(quaternions, dtype=float).tolist(),
+            }
+        )
+        return (
+            np.array(response["positions"], dtype=float).reshape(-1, 3),
+            np.array(response["quaternions"], dtype=float).reshape(-1, 4),
+        )
+
+    async def get_statistics(self) -> dict:
+        """
+        :return: The statistics of the service, see ServiceStatistics
+        """
+        response = await self._request({"statistics": True})
+        return response["statistics"]
+
+    async def _request(self, message: dict) -> dict:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        # The id comes first so it is found even if the message is too long
+        message = {"id": request_id, **message}
+        self._writer.write(json.dumps(message).encode() + b"\n")
+        await self._writer.drain()
+        response = await future
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                line, skipped = await _read_line(self._reader)
+                if skipped:
+                    response: dict = {
+                        "id": _get_message_id(line),
+                        "error": "Response exceeds the limit of the client",
+                    }
+                elif line:
+                    response = json.loads(line)
+                else:
+                    break
+                future = self._pending.pop(response["id"], None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed"))
+            self._pending.clear()
+
+
+async def _read_line(reader: asyncio.StreamReader) -> Tuple[bytes, bool]:
+    """
+    Reads a line like StreamReader.readline, which returns an empty line at the end
+    of the stream. A line longer than the limit of the reader is skipped, so the
+    next line can be read, and the start of it is returned with skipped set to true
+    :return: Tuple of the line and whether it is skipped
+    """
+    try:
+        return await reader.readuntil(b"\n"), False
+    except asyncio.IncompleteReadError as error:
+        return error.partial, False
+    except asyncio.LimitOverrunError as error:
+        start = await reader.readexactly(error.consumed)
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return start, True
+        except asyncio.IncompleteReadError:
+            return start, True
+        except asyncio.LimitOverrunError as error:
+            await reader.readexactly(error.consumed)
+
+
+def _get_message_id(line: bytes) -> Optional[int]:
+    match = _ID_PATTERN.match(line)
+    return int(match.group(1)) if match is not None else None
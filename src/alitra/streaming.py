@@ -0,0 +1,146 @@
+import itertools
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from .models.frame import Frame
+from .transform import Transform
+
+
+@dataclass
+class StreamStatistics:
+    """
+    Number of points and chunks transformed by a stream, and the time spent
+    """
+
+    n_points: int = 0
+    n_chunks: int = 0
+    duration: float = 0.0
+
+    @property
+    def points_per_second(self) -> float:
+        return self.n_points / self.duration if self.duration > 0 else 0.0
+
+
+def transform_chunks(
+    transform: Transform,
+    chunks: Iterable[np.ndarray],
+    from_: Frame,
+    to_: Frame,
+    statistics: Optional[StreamStatistics] = None,
+) -> Iterator[np.ndarray]:
+    """
+    Transforms a stream of position chunks from from_ to to_, one chunk at a time,
+    so only one chunk needs to be in memory
+    :param transform: Transform between from_ and to_
+    :param chunks: Iterable of numpy arrays of positions, shape (k,3)
+    :param from_: Source Frame, must be different to "to_".
+    :param to_: Destination Frame, must be different to "from_".
+    :param statistics: StreamStatistics updated with the points transformed and the
+        time spent transforming them
+    :return: Iterator of transformed numpy arrays, shape (k,3)
+    """
+    for chunk in chunks:
+        if chunk.ndim != 2 or chunk.shape[1] != 3:
+            raise ValueError("chunks should have shape (k,3)")
+        start = time.perf_counter()
+        result = transform.transform_array(chunk, from_, to_)
+        if statistics is not None:
+            statistics.duration += time.perf_counter() - start
+            statistics.n_points += chunk.shape[0]
+            statistics.n_chunks += 1
+        yield result
+
+
+def read_chunks(path: Path, chunk_size: int = 1_000_000) -> Iterator[np.ndarray]:
+    """
+    Reads positions from a .npy-file, which is memory-mapped, or from a csv-file
+    with one x,y,z position per line
+    :param path: Path to a .npy- or csv-file
+    :param chunk_size: Number of positions per chunk
+    :return: Iterator of numpy arrays of positions, shape (k,3)
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        positions = np.load(path, mmap_mode="r")
+        if positions.ndim != 2 or positions.shape[1] != 3:
+            raise ValueError(f"Expected positions of shape (N,3) in {path}")
+        for start in range(0, positions.shape[0], chunk_size):
+            yield np.asarray(positions[start : start + chunk_size])
+        return
+
+    with open(path) as csv_file:
+        while True:
+            lines = list(itertools.islice(csv_file, chunk_size))
+            if not lines:
+                return
+            positions = np.loadtxt(lines, delimiter=",", ndmin=2)
+            if positions.size > 0:
+                yield positions
+
+
+def transform_file(
+    transform: Transform,
+    input_path: Path,
+    output_path: Path,
+    from_: Frame,
+    to_: Frame,
+    chunk_size: int = 1_000_000,
+) -> StreamStatistics:
+    """
+    Transforms the positions in a file chunk by chunk and writes them to another
+    file, so the memory used is bounded by the chunk size. Files ending in .npy are
+    read and written as numpy arrays using memory-mapping, other files as csv with
+    one x,y,z position per line.
+    :param transform: Transform between from_ and to_
+    :param input_path: Path to the .npy- or csv-file with positions in from_
+    :param output_path: Path to the .npy- or csv-file to write positions in to_
+    :param from_: Source Frame, must be different to "to_".
+    :param to_: Destination Frame, must be different to "from_".
+    :param chunk_size: Number of positions per chunk
+    :return: StreamStatistics where the duration includes reading and writing
+    """
+    start = time.perf_counter()
+    statistics = StreamStatistics()
+    chunks = transform_chunks(
+        transform, read_chunks(input_path, chunk_size), from_, to_, statistics
+    )
+
+    output_path = Path(output_path)
+    if output_path.suffix == ".npy":
+        output = np.lib.format.open_memmap(
+            output_path, mode="w+", dtype=float, shape=(_count_positions(input_path), 3)
+        )
+        index = 0
+        for chunk in chunks:
+            if index + chunk.shape[0] > output.shape[0]:
+                raise ValueError(
+                    f"Expected {output.shape[0]} positions in {input_path}, got more"
+                )
+            output[index : index + chunk.shape[0]] = chunk
+            index += chunk.shape[0]
+        output.flush()
+        if index != output.shape[0]:
+            raise ValueError(
+                f"Expected {output.shape[0]} positions in {input_path}, got {index}"
+            )
+        del output
+    else:
+        with open(output_path, "w") as csv_file:
+            for chunk in chunks:
+                np.savetxt(csv_file, chunk, delimiter=",")
+
+    statistics.duration = time.perf_counter() - start
+    return statistics
+
+
+def _count_positions(path: Path) -> int:
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r").shape[0]
+    # Skips comments and blank lines the same way np.loadtxt does in read_chunks
+    with open(path) as csv_file:
+        return sum(1 for line in csv_file if line.split("#", 1)[0].strip())
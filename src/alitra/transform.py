@@ -1,17 +1,105 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Union
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Optional, Tuple, Union, overload
 
 import numpy as np
 from scipy.spatial.transform import Rotation
 
+from .instrumentation import instrumented
+from .models.bounds import Bounds
 from .models.frame import Frame
-from .models.orientation import Orientation
-from .models.pose import Pose
-from .models.position import Position, Positions
+from .models.orientation import Orientation, Orientations
+from .models.pose import Pose, PoseArray
+from .models.position import Position, Positions, _get_float_dtype
 from .models.translation import Translation
 
+_IN_PLACE_BLOCK_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class _CompiledTransform:
+    """
+    Matrices and vectors of a transform and its inverse, computed once per rotation
+    and translation. Positions are stored as rows, so they are transformed as
+    positions @ rotation_matrix.T + translation
+    """
+
+    rotation: Rotation
+    rotation_matrix: np.ndarray
+    translation: np.ndarray
+    homogeneous_matrix: np.ndarray
+    inverse_rotation: Rotation
+    inverse_rotation_matrix: np.ndarray
+    inverse_translation: np.ndarray
+    inverse_homogeneous_matrix: np.ndarray
+    _cast: Dict[Tuple[bool, np.dtype], Tuple[np.ndarray, np.ndarray]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def get_matrices(
+        self, inverse: bool, dtype: np.dtype
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param inverse: Set to true to get the rotation matrix and translation of the
+            inverse transform
+        :param dtype: Floating point data type of the positions to transform
+        :return: Read-only rotation matrix and translation cast to dtype
+        """
+        key = (inverse, dtype)
+        matrices = self._cast.get(key)
+        if matrices is None:
+            if inverse:
+                matrices = (self.inverse_rotation_matrix, self.inverse_translation)
+            else:
+                matrices = (self.rotation_matrix, self.translation)
+            matrices = tuple(_read_only(array.astype(dtype)) for array in matrices)
+            self._cast[key] = matrices
+        return matrices
+
+    @staticmethod
+    def from_rotation_and_translation(
+        rotation: Rotation, translation: Translation
+    ) -> _CompiledTransform:
+        if rotation is None:
+            rotation = Rotation.identity()
+        rotation_matrix = rotation.as_matrix()
+        translation_array = translation.to_array()
+        inverse_rotation_matrix = np.ascontiguousarray(rotation_matrix.T)
+        inverse_translation = -inverse_rotation_matrix @ translation_array
+
+        compiled = _CompiledTransform(
+            rotation=rotation,
+            rotation_matrix=rotation_matrix,
+            translation=translation_array,
+            homogeneous_matrix=_homogeneous_matrix(rotation_matrix, translation_array),
+            inverse_rotation=rotation.inv(),
+            inverse_rotation_matrix=inverse_rotation_matrix,
+            inverse_translation=inverse_translation,
+            inverse_homogeneous_matrix=_homogeneous_matrix(
+                inverse_rotation_matrix, inverse_translation
+            ),
+        )
+        for value in vars(compiled).values():
+            if isinstance(value, np.ndarray):
+                _read_only(value)
+        return compiled
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+def _homogeneous_matrix(
+    rotation_matrix: np.ndarray, translation: np.ndarray
+) -> np.ndarray:
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation_matrix
+    matrix[:3, 3] = translation
+    return matrix
+
 
 @dataclass
 class Transform:
@@ -36,6 +124,78 @@ class Transform:
                 f"The from_ frames or to_ frames of translation and transform object are not equal."
             )
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ("rotation", "translation"):
+            self.__dict__.pop("_compiled", None)
+
+    @cached_property
+    def _compiled(self) -> _CompiledTransform:
+        return _CompiledTransform.from_rotation_and_translation(
+            self.rotation, self.translation
+        )
+
+    def as_matrix(self, inverse: bool = False) -> np.ndarray:
+        """
+        :param inverse: Set to true to get the matrix of the inverse transform
+        :return: Read-only homogeneous transformation matrix, shape (4,4)
+        """
+        if inverse:
+            return self._compiled.inverse_homogeneous_matrix
+        return self._compiled.homogeneous_matrix
+
+    def inverse(self) -> Transform:
+        """
+        :return: Transform from to_ to from_
+        """
+        compiled = self._compiled
+        return Transform(
+            translation=Translation.from_array(
+                compiled.inverse_translation, from_=self.to_, to_=self.from_
+            ),
+            from_=self.to_,
+            to_=self.from_,
+            rotation=compiled.inverse_rotation,
+        )
+
+    def compose(self, other: Transform) -> Transform:
+        """
+        Combines this transform with a transform starting in the to_ frame of this
+        transform
+        :param other: Transform from the to_ frame of this transform to another frame
+        :return: Transform from the from_ frame of this transform to the to_ frame of
+            other
+        """
+        if other.from_ != self.to_:
+            raise ValueError(
+                f"Expected a transform from frame {self.to_}, got a transform from "
+                + f"frame {other.from_}"
+            )
+        compiled = self._compiled
+        other_compiled = other._compiled
+        return Transform(
+            translation=Translation.from_array(
+                other_compiled.rotation_matrix @ compiled.translation
+                + other_compiled.translation,
+                from_=self.from_,
+                to_=other.to_,
+            ),
+            from_=self.from_,
+            to_=other.to_,
+            rotation=other_compiled.rotation * compiled.rotation,
+        )
+
+    @overload
+    def transform_position(
+        self, positions: Position, from_: Frame, to_: Frame
+    ) -> Position: ...
+
+    @overload
+    def transform_position(
+        self, positions: Positions, from_: Frame, to_: Frame
+    ) -> Positions: ...
+
+    @instrumented("Transform.transform_position", "positions")
     def transform_position(
         self,
         positions: Union[Position, Positions],
@@ -58,26 +218,129 @@ class Transform:
         if from_ == to_:
             return positions
 
-        result: np.ndarray
-        if from_ == self.to_ and to_ == self.from_:
+        result = self.transform_array(positions.to_array(), from_, to_)
+
+        if isinstance(positions, Position):
+            return Position.from_array(result, to_)
+        elif isinstance(positions, Positions):
+            return Positions.from_array(result, to_, copy=False)
+        else:
+            raise ValueError("Incorrect input format. Must be Position or Positions.")
+
+    def transform_array(
+        self,
+        positions: np.ndarray,
+        from_: Frame,
+        to_: Frame,
+        out: Optional[np.ndarray] = None,
+        in_place: bool = False,
+        origin_from: Optional[np.ndarray] = None,
+        origin_to: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Transforms a numpy array of positions from from_ to to_ (rotation and
+        translation) without creating Position or Positions objects. Floating point
+        arrays keep their data type, e.g. float32 positions are transformed with
+        float32 arithmetic
+        :param positions: Numpy array of positions in the from_ coordinate system,
+            shape (3,) or (N,3).
+        :param from_: Source Frame, must be different to "to_".
+        :param to_: Destination Frame, must be different to "from_".
+        :param out: Preallocated numpy array with the same shape as positions to
+            write the result to. Reusing a buffer that does not overlap positions
+            avoids allocating intermediate or result arrays
+        :param in_place: Set to true to write the result to positions. Positions
+            are transformed in blocks through a scratch buffer of at most
+            4096 rows, so no array the size of positions is allocated
+        :param origin_from: Origin of positions in the from_ coordinate system,
+            shape (3,). Positions are given relative to this origin
+        :param origin_to: Origin of the result in the to_ coordinate system, shape
+            (3,). The result is given relative to this origin. Together with
+            origin_from this keeps float32 positions far from the frame origins,
+            e.g. UTM coordinates, precise, as the origins are applied to the
+            translation in float64
+        :return: Numpy array of positions in the to_ coordinate system, out or
+            positions if given
+        """
+        if in_place:
+            if out is not None:
+                raise ValueError("out can not be given when in_place is true")
+            out = positions
+
+        if from_ == to_ and origin_from is None and origin_to is None:
+            if out is None:
+                return positions
+            np.copyto(out, positions)
+            return out
+
+        dtype = _get_float_dtype(positions)
+        # The origins are applied in float64, before casting to the dtype of positions
+        matrices_dtype = (
+            dtype if origin_from is None and origin_to is None else np.dtype(float)
+        )
+        if from_ == to_:
+            rotation_matrix, translation = np.eye(3), np.zeros(3)
+        elif from_ == self.to_ and to_ == self.from_:
             """Using the inverse transform"""
-            result = self.rotation.apply(
-                positions.to_array() - self.translation.to_array(),
-                inverse=True,
+            rotation_matrix, translation = self._compiled.get_matrices(
+                inverse=True, dtype=matrices_dtype
             )
         elif from_ == self.from_ and to_ == self.to_:
-            result = (
-                self.rotation.apply(positions.to_array()) + self.translation.to_array()
+            rotation_matrix, translation = self._compiled.get_matrices(
+                inverse=False, dtype=matrices_dtype
             )
         else:
             raise ValueError("Transform not specified")
 
-        if isinstance(positions, Position):
-            return Position.from_array(result, to_)
-        elif isinstance(positions, Positions):
-            return Positions.from_array(result, to_)
-        else:
-            raise ValueError("Incorrect input format. Must be Position or Positions.")
+        if origin_from is not None:
+            translation = translation + rotation_matrix @ np.asarray(
+                origin_from, dtype=float
+            )
+        if origin_to is not None:
+            translation = translation - np.asarray(origin_to, dtype=float)
+        rotation_matrix = rotation_matrix.astype(dtype, copy=False)
+        translation = translation.astype(dtype, copy=False)
+
+        if out is None:
+            return positions @ rotation_matrix.T + translation
+        if in_place:
+            # The matrix product can not write to its input, so blocks of rows go
+            # through a small scratch buffer instead of a copy of all positions
+            rows = np.atleast_2d(positions)
+            scratch = np.empty((min(_IN_PLACE_BLOCK_SIZE, rows.shape[0]), 3), dtype)
+            for start in range(0, rows.shape[0], _IN_PLACE_BLOCK_SIZE):
+                block = rows[start : start + _IN_PLACE_BLOCK_SIZE]
+                result = scratch[: block.shape[0]]
+                np.matmul(block, rotation_matrix.T, out=result)
+                np.add(result, translation, out=block)
+            return positions
+        np.matmul(positions, rotation_matrix.T, out=out)
+        np.add(out, translation, out=out)
+        return out
+
+    def transform_position_within_bounds(
+        self, positions: Positions, from_: Frame, to_: Frame, bounds: Bounds
+    ) -> Tuple[Positions, np.ndarray]:
+        """
+        Transforms positions from from_ to to_ and keeps the ones within bounds
+        :param positions: Positions in the from_ coordinate system.
+        :param from_: Source Frame, must be different to "to_".
+        :param to_: Destination Frame, must be different to "from_".
+        :param bounds: Bounds in the to_ coordinate system.
+        :return: Tuple of the transformed positions within bounds, and a boolean
+            numpy array of shape (N,) which is true for the input positions that
+            are within bounds
+        """
+        if bounds.frame != to_:
+            raise ValueError(
+                f"Expected bounds in frame {to_}, got bounds in frame {bounds.frame}"
+            )
+        positions_to = self.transform_position(positions, from_, to_)
+        mask = bounds.positions_within_bounds(positions_to)
+        return (
+            Positions.from_array(positions_to.to_array()[mask], to_, copy=False),
+            mask,
+        )
 
     def transform_rotation(
         self, rotation: Rotation, from_: Frame, to_: Frame
@@ -92,52 +355,80 @@ class Transform:
 
         if from_ == self.to_ and to_ == self.from_:
             "Using the inverse transform"
-            rotation_to = rotation * self.rotation.inv()
+            rotation_to = rotation * self._compiled.inverse_rotation
         elif from_ == self.from_ and to_ == self.to_:
-            rotation_to = rotation * self.rotation
+            rotation_to = rotation * self._compiled.rotation
         else:
             raise ValueError("Transform not specified")
 
         return rotation_to
 
+    @overload
+    def transform_orientation(
+        self, orientation: Orientation, from_: Frame, to_: Frame
+    ) -> Orientation: ...
+
+    @overload
+    def transform_orientation(
+        self, orientation: Orientations, from_: Frame, to_: Frame
+    ) -> Orientations: ...
+
+    @instrumented("Transform.transform_orientation", "orientation")
     def transform_orientation(
         self,
-        orientation: Orientation,
+        orientation: Union[Orientation, Orientations],
         from_: Frame,
         to_: Frame,
-    ) -> Orientation:
+    ) -> Union[Orientation, Orientations]:
         """
-        Transforms an orientation from from_ to to_ (rotation)
-        :param orientation: Orientation in the from_ coordinate system.
+        Transforms an orientation or orientations from from_ to to_ (rotation)
+        :param orientation: Orientation or Orientations in the from_ coordinate system.
         :param from_: Source Frame, must be different to "to_".
         :param to_: Destination Frame, must be different to "from_".
-        :return: Orientation in the to_ coordinate system.
+        :return: Orientation or Orientations in the to_ coordinate system.
         """
 
         if from_ == to_:
             return orientation
 
         rotation_to = self.transform_rotation(orientation.to_rotation(), from_, to_)
+        if isinstance(orientation, Orientations):
+            return Orientations.from_rotation(rotation_to, frame=to_)
         return Orientation(*rotation_to.as_quat(), frame=to_)  # type: ignore
 
-    def transform_pose(self, pose: Pose, from_: Frame, to_: Frame) -> Pose:
+    @overload
+    def transform_pose(self, pose: Pose, from_: Frame, to_: Frame) -> Pose: ...
+
+    @overload
+    def transform_pose(
+        self, pose: PoseArray, from_: Frame, to_: Frame
+    ) -> PoseArray: ...
+
+    @instrumented("Transform.transform_pose", "pose")
+    def transform_pose(
+        self, pose: Union[Pose, PoseArray], from_: Frame, to_: Frame
+    ) -> Union[Pose, PoseArray]:
         """
-        Transforms a pose from from_ to to_ (rotation)
-        :param pose: Pose in the from_ coordinate system.
+        Transforms a pose or an array of poses from from_ to to_ (rotation and
+        translation)
+        :param pose: Pose or PoseArray in the from_ coordinate system.
         :param from_: Source Frame, must be different to "to_".
         :param to_: Destination Frame, must be different to "from_".
-        :return: Pose in the to_ coordinate system.
+        :return: Pose or PoseArray in the to_ coordinate system.
         """
 
         if from_ == to_:
             return pose
 
+        if isinstance(pose, PoseArray):
+            positions = self.transform_position(pose.positions, from_, to_)
+            orientations = self.transform_orientation(pose.orientations, from_, to_)
+            return PoseArray(positions, orientations.to_quat_array(), to_)
+
         position = self.transform_position(pose.position, from_, to_)
         if not isinstance(position, Position):
             raise TypeError("Pose can only contain a single position, not positions")
-        orientation: Orientation = self.transform_orientation(
-            pose.orientation, from_, to_
-        )
+        orientation = self.transform_orientation(pose.orientation, from_, to_)
 
         return Pose(position, orientation, to_)
 
@@ -0,0 +1,179 @@
+from typing import Tuple
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from .models.frame import Frame
+from .models.position import Positions
+from .models.translation import Translation
+from .transform import Transform
+
+
+class TransformBuffer:
+    """
+    A bounded buffer of time-stamped transforms between two frames, for transforms
+    that change over time such as the localization of a robot. Transforms must be
+    added in increasing time order, and when the buffer is full the oldest transform
+    is dropped. Transforms between two stored timestamps are interpolated, linearly
+    for the translation and with slerp for the rotation.
+    """
+
+    def __init__(self, from_: Frame, to_: Frame, max_size: int = 1000) -> None:
+        if max_size < 1:
+            raise ValueError(f"Expected max_size of at least 1, got {max_size}")
+        self.from_ = from_
+        self.to_ = to_
+        self.max_size = max_size
+        # The arrays hold twice max_size entries, so the stored transforms can be
+        # kept as one contiguous, sorted slice and only moved every max_size adds
+        self._timestamps = np.empty(2 * max_size)
+        self._translations = np.empty((2 * max_size, 3))
+        self._quaternions = np.empty((2 * max_size, 4))
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """
+        :return: Timestamps of the stored transforms in increasing order
+        """
+        return self._timestamps[self._start : self._end]
+
+    def add_transform(self, timestamp: float, transform: Transform) -> None:
+        """
+        :param timestamp: Time the transform is valid at, must be later than the
+            timestamp of the previously added transform
+        :param transform: Transform from from_ to to_ of the buffer
+        """
+        if transform.from_ != self.from_ or transform.to_ != self.to_:
+            raise ValueError(
+                f"Expected a transform from {self.from_} to {self.to_}, got a "
+                + f"transform from {transform.from_} to {transform.to_}"
+            )
+        if len(self) > 0 and timestamp <= self._timestamps[self._end - 1]:
+            raise ValueError(
+                f"Expected timestamps in increasing order, got {timestamp} after "
+                + f"{self._timestamps[self._end - 1]}"
+            )
+
+        if self._end == self._timestamps.shape[0]:
+            self._compact()
+        self._timestamps[self._end] = timestamp
+        self._translations[self._end] = transform.translation.to_array()
+        self._quaternions[self._end] = transform.rotation.as_quat()
+        self._end += 1
+        if len(self) > self.max_size:
+            self._start += 1
+
+    def interpolate(self, timestamps: np.ndarray) -> Tuple[np.ndarray, Rotation]:
+        """
+        :param timestamps: Numpy array of timestamps, shape (N,)
+        :return: Tuple of the interpolated translations, shape (N,3), and a scipy
+            Rotation holding the N interpolated rotations
+        """
+        timestamps = np.asarray(timestamps, dtype=float).reshape(-1)
+        stored = self.timestamps
+        if stored.shape[0] == 0:
+            raise ValueError("The transform buffer is empty")
+        if np.any(timestamps < stored[0]) or np.any(timestamps > stored[-1]):
+            raise ValueError(
+                f"Timestamps must be between {stored[0]} and {stored[-1]}, the "
+                + "transform can not be extrapolated"
+            )
+
+        translations = self._translations[self._start : self._end]
+        quaternions = self._quaternions[self._start : self._end]
+        if stored.shape[0] == 1:
+            return (
+                np.repeat(translations, timestamps.shape[0], axis=0),
+                Rotation.from_quat(np.repeat(quaternions, timestamps.shape[0], axis=0)),
+            )
+
+        index_0 = np.clip(
+            np.searchsorted(stored, timestamps, side="right") - 1,
+            0,
+            stored.shape[0] - 2,
+        )
+        index_1 = index_0 + 1
+        alpha = (timestamps - stored[index_0]) / (stored[index_1] - stored[index_0])
+
+        translation_0 = translations[index_0]
+        interpolated_translations = translation_0 + alpha[:, np.newaxis] * (
+            translations[index_1] - translation_0
+        )
+
+        rotation_0 = Rotation.from_quat(quaternions[index_0])
+        rotation_1 = Rotation.from_quat(quaternions[index_1])
+        delta = (rotation_0.inv() * rotation_1).as_rotvec()
+        interpolated_rotations = rotation_0 * Rotation.from_rotvec(
+            alpha[:, np.newaxis] * delta
+        )
+        return interpolated_translations, interpolated_rotations
+
+    def get_transform(self, timestamp: float) -> Transform:
+        """
+        :param timestamp: Time to get the transform at
+        :return: Transform from from_ to to_ valid at the timestamp
+        """
+        translations, rotations = self.interpolate(np.array([timestamp]))
+        return Transform(
+            translation=Translation.from_array(
+                translations[0], from_=self.from_, to_=self.to_
+            ),
+            from_=self.from_,
+            to_=self.to_,
+            rotation=rotations[0],
+        )
+
+    def transform_position(
+        self, positions: Positions, timestamps: np.ndarray, from_: Frame, to_: Frame
+    ) -> Positions:
+        """
+        Transforms each position with the transform valid at its own timestamp
+        :param positions: Positions in the from_ coordinate system.
+        :param timestamps: Numpy array of one timestamp per position, shape (N,)
+        :param from_: Source Frame, must be different to "to_".
+        :param to_: Destination Frame, must be different to "from_".
+        :return: Positions in the to_ coordinate system.
+        """
+        if positions.frame != from_:
+            raise ValueError(
+                f"Expected positions in frame {from_} "
+                + f", got positions in frame {positions.frame}"
+            )
+        if np.shape(timestamps) != (len(positions),):
+            raise ValueError(
+                f"Expected one timestamp per position, got {np.shape(timestamps)} "
+                + f"timestamps for {len(positions)} positions"
+            )
+
+        if from_ == to_:
+            return positions
+
+        translations, rotations = self.interpolate(timestamps)
+        rotation_matrices = rotations.as_matrix()
+        if from_ == self.to_ and to_ == self.from_:
+            """Using the inverse transform"""
+            result = np.einsum(
+                "nji,nj->ni", rotation_matrices, positions.to_array() - translations
+            )
+        elif from_ == self.from_ and to_ == self.to_:
+            result = (
+                np.einsum("nij,nj->ni", rotation_matrices, positions.to_array())
+                + translations
+            )
+        else:
+            raise ValueError("Transform not specified")
+
+        return Positions.from_array(result, to_, copy=False)
+
+    def _compact(self) -> None:
+        """Moves the stored transforms to the start of the arrays"""
+        count = len(self)
+        for array in (self._timestamps, self._translations, self._quaternions):
+            array[:count] = array[self._start : self._end]
+        self._start = 0
+        self._end = count
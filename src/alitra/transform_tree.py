@@ -0,0 +1,164 @@
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
+
+from scipy.spatial.transform import Rotation
+
+from .models.frame import Frame
+from .models.orientation import Orientation, Orientations
+from .models.pose import Pose, PoseArray
+from .models.position import Position, Positions
+from .models.translation import Translation
+from .transform import Transform
+
+_Edge = FrozenSet[Frame]
+
+
+class TransformTree:
+    """
+    A registry of transforms between frames. The transforms are the edges of a graph
+    of frames, and a transform between any two connected frames is found by
+    combining the transforms along the path between them. Combined transforms are
+    cached until a transform on their path is added, replaced or removed.
+    """
+
+    def __init__(self, transforms: Optional[List[Transform]] = None) -> None:
+        self._neighbours: Dict[Frame, Set[Frame]] = {}
+        self._transforms: Dict[Tuple[Frame, Frame], Transform] = {}
+        self._cache: Dict[Tuple[Frame, Frame], Tuple[Transform, Set[_Edge]]] = {}
+        for transform in transforms or []:
+            self.add_transform(transform)
+
+    @property
+    def frames(self) -> List[Frame]:
+        """
+        :return: All frames with at least one transform
+        """
+        return list(self._neighbours)
+
+    def add_transform(self, transform: Transform) -> None:
+        """
+        Adds a transform to the tree, replacing any existing transform between the
+        same two frames
+        :param transform: Transform between two frames
+        """
+        from_, to_ = transform.from_, transform.to_
+        if from_ == to_:
+            raise ValueError("Expected a transform between two different frames")
+
+        edge: _Edge = frozenset((from_, to_))
+        if self._pop_transform(from_, to_) is None:
+            self._cache.clear()
+        else:
+            self._invalidate(edge)
+
+        self._transforms[(from_, to_)] = transform
+        self._neighbours.setdefault(from_, set()).add(to_)
+        self._neighbours.setdefault(to_, set()).add(from_)
+
+    def remove_transform(self, from_: Frame, to_: Frame) -> None:
+        """
+        Removes the transform between two frames, in either direction
+        :param from_: One of the frames of the transform
+        :param to_: The other frame of the transform
+        """
+        if self._pop_transform(from_, to_) is None:
+            raise ValueError(f"No transform between frame {from_} and frame {to_}")
+        self._invalidate(frozenset((from_, to_)))
+        self._neighbours[from_].discard(to_)
+        self._neighbours[to_].discard(from_)
+        for frame in (from_, to_):
+            if not self._neighbours[frame]:
+                del self._neighbours[frame]
+
+    def get_transform(self, from_: Frame, to_: Frame) -> Transform:
+        """
+        :param from_: Frame the transform is coming from
+        :param to_: Frame the transform is going to
+        :return: Transform from from_ to to_, combined from the transforms on the
+            path between the two frames
+        """
+        if from_ == to_:
+            return Transform(
+                translation=Translation(x=0, y=0, from_=from_, to_=to_),
+                from_=from_,
+                to_=to_,
+                rotation=Rotation.identity(),
+            )
+
+        key = (from_, to_)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached[0]
+
+        path = self._find_path(from_, to_)
+        if path is None:
+            raise ValueError(f"Transform not specified between {from_} and {to_}")
+
+        transform = self._get_edge_transform(path[0], path[1])
+        for edge_from, edge_to in zip(path[1:], path[2:]):
+            transform = transform.compose(self._get_edge_transform(edge_from, edge_to))
+
+        edges = {frozenset(edge) for edge in zip(path, path[1:])}
+        self._cache[key] = (transform, edges)
+        return transform
+
+    def transform_position(
+        self, positions: Union[Position, Positions], from_: Frame, to_: Frame
+    ) -> Union[Position, Positions]:
+        """
+        See Transform.transform_position
+        """
+        return self.get_transform(from_, to_).transform_position(positions, from_, to_)
+
+    def transform_orientation(
+        self, orientation: Union[Orientation, Orientations], from_: Frame, to_: Frame
+    ) -> Union[Orientation, Orientations]:
+        """
+        See Transform.transform_orientation
+        """
+        return self.get_transform(from_, to_).transform_orientation(
+            orientation, from_, to_
+        )
+
+    def transform_pose(
+        self, pose: Union[Pose, PoseArray], from_: Frame, to_: Frame
+    ) -> Union[Pose, PoseArray]:
+        """
+        See Transform.transform_pose
+        """
+        return self.get_transform(from_, to_).transform_pose(pose, from_, to_)
+
+    def _pop_transform(self, from_: Frame, to_: Frame) -> Optional[Transform]:
+        transform = self._transforms.pop((from_, to_), None)
+        if transform is None:
+            transform = self._transforms.pop((to_, from_), None)
+        return transform
+
+    def _get_edge_transform(self, from_: Frame, to_: Frame) -> Transform:
+        transform = self._transforms.get((from_, to_))
+        if transform is None:
+            transform = self._transforms[(to_, from_)].inverse()
+        return transform
+
+    def _invalidate(self, edge: _Edge) -> None:
+        for key in [key for key, (_, edges) in self._cache.items() if edge in edges]:
+            del self._cache[key]
+
+    def _find_path(self, from_: Frame, to_: Frame) -> Optional[List[Frame]]:
+        """Breadth first search for the path with the fewest transforms"""
+        if from_ not in self._neighbours or to_ not in self._neighbours:
+            return None
+        previous: Dict[Frame, Optional[Frame]] = {from_: None}
+        queue = deque([from_])
+        while queue:
+            frame = queue.popleft()
+            if frame == to_:
+                path = [frame]
+                while previous[path[-1]] is not None:
+                    path.append(previous[path[-1]])
+                return path[::-1]
+            for neighbour in self._neighbours[frame]:
+                if neighbour not in previous:
+                    previous[neighbour] = frame
+                    queue.append(neighbour)
+        return None
@@ -1,6 +1,7 @@
+import numpy as np
 import pytest
 
-from alitra import Bounds, Position
+from alitra import Bounds, Position, Positions
 
 
 def test_eq_bounds(default_bounds, robot_frame):
@@ -24,3 +25,31 @@ def test_position_wrong_frame(default_bounds, asset_frame):
     pos = Position(0.5, 0.5, 0.5, asset_frame)
     with pytest.raises(ValueError):
         default_bounds.position_within_bounds(pos)
+
+
+def test_positions_within_bounds(default_bounds, robot_frame):
+    positions = Positions.from_array(
+        np.array([[0.5, 0.5, 0.5], [11, 11, 11], [1, 1, 1], [0.5, -0.1, 0.5]]),
+        frame=robot_frame,
+    )
+    expected_mask = np.array([True, False, True, False])
+    mask = default_bounds.positions_within_bounds(positions)
+    assert np.array_equal(mask, expected_mask)
+    assert np.array_equal(
+        mask, [default_bounds.position_within_bounds(pos) for pos in positions]
+    )
+    assert np.array_equal(
+        default_bounds.positions_within_bounds(positions.to_array()), expected_mask
+    )
+
+    filtered: Positions = default_bounds.filter_positions(positions)
+    assert filtered.frame == robot_frame
+    assert np.allclose(filtered.to_array(), positions.to_array()[expected_mask])
+
+
+def test_positions_within_bounds_wrong_frame(default_bounds, asset_frame):
+    positions = Positions.from_array(np.array([[0.5, 0.5, 0.5]]), frame=asset_frame)
+    with pytest.raises(ValueError):
+        default_bounds.positions_within_bounds(positions)
+    with pytest.raises(ValueError):
+        default_bounds.positions_within_bounds(np.array([0.5, 0.5, 0.5]))
@@ -1,3 +1,9 @@
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
 from alitra import Frame
 
 
@@ -5,3 +11,28 @@ def test_frame():
     expected_frame = Frame("test")
     frame: Frame = Frame("test")
     assert frame == expected_frame
+
+
+def test_frame_interned():
+    assert Frame("test") is Frame("test")
+    assert Frame(name="test") is Frame("test")
+    assert Frame("test") != Frame("other")
+
+
+def test_frame_hashable():
+    frames = {Frame("test"): 1, Frame("other"): 2}
+    assert frames[Frame("test")] == 1
+    assert len({Frame("test"), Frame("test")}) == 1
+
+
+def test_frame_frozen():
+    frame = Frame("test")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frame.name = "other"  # type: ignore
+
+
+def test_frame_pickle_and_copy():
+    frame = Frame("test")
+    assert pickle.loads(pickle.dumps(frame)) is frame
+    assert copy.copy(frame) is frame
+    assert copy.deepcopy(frame) is frame
@@ -1,5 +1,8 @@
+import shutil
 from pathlib import Path
+from typing import List
 
+import numpy as np
 import pytest
 
 from alitra import Bounds, Frame, Map, MapAlignment, Position, Positions
@@ -65,3 +68,65 @@ def test_mapalignment():
     map_path = Path("./tests/test_data/test_mapalignment.json")
     map_alignment: MapAlignment = MapAlignment.from_config(map_path)
     assert map_alignment.map_from == expected_map
+
+
+def test_load_map_without_dacite():
+    map_path = Path("./tests/test_data/test_map_robot.json")
+    map: Map = Map.from_config(map_path, use_dacite=False)
+    assert map == expected_map
+
+
+def test_load_map_bounds_without_dacite():
+    map_path = Path("./tests/test_data/test_map_bounds.json")
+    map: Map = Map.from_config(map_path, use_dacite=False)
+    assert map == expected_map_bounds
+
+
+def test_mapalignment_without_dacite():
+    map_path = Path("./tests/test_data/test_mapalignment.json")
+    map_alignment: MapAlignment = MapAlignment.from_config(map_path, use_dacite=False)
+    assert map_alignment == MapAlignment.from_config(map_path)
+
+
+def test_map_from_invalid_dict():
+    with pytest.raises(ValueError):
+        Map.from_dict({"name": "test_map", "frame": {"name": "robot"}})
+    with pytest.raises(ValueError):
+        Map.from_dict(
+            {
+                "name": "test_map",
+                "frame": {"name": "robot"},
+                "reference_positions": {
+                    "positions": [{"x": 1, "y": "a", "z": 0}],
+                    "frame": {"name": "robot"},
+                },
+            }
+        )
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_load_map_directory(tmp_path, max_workers):
+    for name in ["test_map_robot", "test_map_bounds"]:
+        shutil.copy(Path(f"./tests/test_data/{name}.json"), tmp_path)
+    maps: List[Map] = Map.from_config_directory(tmp_path, max_workers=max_workers)
+    assert maps == [expected_map_bounds, expected_map]
+
+
+@pytest.mark.parametrize("mmap_mode", ["r", None])
+def test_binary_map(tmp_path, mmap_mode):
+    expected_map_bounds.to_binary(tmp_path / "map")
+    map: Map = Map.from_binary(tmp_path / "map", mmap_mode=mmap_mode)
+    assert map == expected_map_bounds
+    assert map.bounds.x_max == expected_map_bounds.bounds.x_max
+
+
+def test_binary_map_is_memory_mapped(tmp_path):
+    expected_map.to_binary(tmp_path / "map")
+    map: Map = Map.from_binary(tmp_path / "map")
+    assert map == expected_map
+    assert map.bounds is None
+    position_array = map.reference_positions.to_array()
+    assert isinstance(position_array.base, np.memmap) or isinstance(
+        position_array, np.memmap
+    )
+    assert not position_array.flags.writeable
@@ -1,7 +1,8 @@
 import numpy as np
 import pytest
+from scipy.spatial.transform import Rotation
 
-from alitra import Orientation
+from alitra import Orientation, Orientations
 
 
 def test_orientation_quat_array(robot_frame):
@@ -24,3 +25,53 @@ def test_orientation_invalid_quat_array(robot_frame):
 def test_orientation_invalid_euler_array(robot_frame):
     with pytest.raises(ValueError):
         Orientation.from_euler_array(np.array([1, 1]), frame=robot_frame)
+
+
+def test_orientation_euler_array_wrap_angles(robot_frame):
+    orientation: Orientation = Orientation.from_euler_array(
+        np.array([-np.pi / 2, 0, 0]), robot_frame
+    )
+    assert np.allclose(
+        orientation.to_euler_array(wrap_angles=True), np.array([3 * np.pi / 2, 0, 0])
+    )
+
+
+def test_orientations_quat_array(robot_frame):
+    expected_array = Rotation.random(10, random_state=0).as_quat()
+    orientations: Orientations = Orientations.from_quat_array(
+        expected_array, robot_frame
+    )
+    assert len(orientations) == 10
+    assert np.allclose(orientations.to_quat_array(), expected_array)
+    assert np.allclose(orientations[3].to_quat_array(), expected_array[3])
+    assert len(orientations[2:5]) == 3
+
+
+def test_orientations_euler_array(robot_frame):
+    expected_euler = np.array([[1, 1, 1], [0.5, -0.2, 0.1], [-2, 0.3, 3]])
+    orientations: Orientations = Orientations.from_euler_array(
+        expected_euler, robot_frame
+    )
+    assert np.allclose(orientations.to_euler_array(), expected_euler)
+    for orientation, euler in zip(orientations, expected_euler):
+        assert np.allclose(orientation.to_euler_array(), euler)
+
+
+def test_orientations_euler_array_wrap_angles(robot_frame):
+    euler = np.array([[-90, 0, 0], [270, 10, -10]])
+    orientations: Orientations = Orientations.from_euler_array(
+        euler, robot_frame, degrees=True
+    )
+    for orientation, wrapped in zip(
+        orientations, orientations.to_euler_array(degrees=True, wrap_angles=True)
+    ):
+        assert np.allclose(
+            orientation.to_euler_array(degrees=True, wrap_angles=True), wrapped
+        )
+
+
+def test_orientations_invalid_arrays(robot_frame):
+    with pytest.raises(ValueError):
+        Orientations.from_quat_array(np.array([0, 0, 0, 1]), frame=robot_frame)
+    with pytest.raises(ValueError):
+        Orientations.from_euler_array(np.array([1, 1, 1]), frame=robot_frame)
@@ -1,6 +1,7 @@
 import numpy as np
+import pytest
 
-from alitra import Frame, Pose
+from alitra import Frame, Pose, PoseArray
 
 
 def test_pose_array():
@@ -15,3 +16,43 @@ def test_pose_array():
     assert pose.frame == expected_frame
     assert np.allclose(pos_array, expected_pos_array)
     assert np.allclose(quat_array, expected_quat_array)
+
+
+def test_pose_array_batch():
+    expected_pos_array = np.array([[0, 0, 0], [1, 2, 3]])
+    expected_quat_array = np.array([[0, 0, 0, 1], [0, 0, 1, 0]])
+    expected_frame = Frame("robot")
+
+    poses: PoseArray = PoseArray.from_array(
+        expected_pos_array, expected_quat_array, expected_frame
+    )
+    pos_array, quat_array = poses.to_array()
+    assert len(poses) == 2
+    assert poses.frame == expected_frame
+    assert np.allclose(pos_array, expected_pos_array)
+    assert np.allclose(quat_array, expected_quat_array)
+
+    pose: Pose = poses[1]
+    assert np.allclose(pose.position.to_array(), expected_pos_array[1])
+    assert np.allclose(pose.orientation.to_quat_array(), expected_quat_array[1])
+
+
+def test_pose_array_from_poses(default_pose, robot_frame):
+    poses: PoseArray = PoseArray.from_poses([default_pose, default_pose], robot_frame)
+    assert len(poses) == 2
+    pos_array, quat_array = poses.to_array()
+    assert np.allclose(pos_array, [default_pose.position.to_array()] * 2)
+    assert np.allclose(quat_array, [default_pose.orientation.to_quat_array()] * 2)
+
+
+def test_pose_array_invalid_shapes(robot_frame):
+    with pytest.raises(ValueError):
+        PoseArray.from_array(np.zeros((2, 3)), np.zeros((3, 4)), robot_frame)
+    with pytest.raises(ValueError):
+        PoseArray.from_array(np.zeros((2, 3)), np.zeros((2, 3)), robot_frame)
+
+
+def test_pose_slots(robot_frame):
+    pose = Pose.from_array(np.array([1, 2, 3]), np.array([0, 0, 0, 1]), robot_frame)
+    assert not hasattr(pose, "__dict__")
+    assert not hasattr(pose.orientation, "__dict__")
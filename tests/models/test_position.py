@@ -1,3 +1,6 @@
+import dataclasses
+
+import dacite
 import numpy as np
 import pytest
 
@@ -24,3 +27,106 @@ def test_position_list_array(robot_frame):
 def test_positions_invalid_array(robot_frame):
     with pytest.raises(ValueError):
         Positions.from_array(np.array([[1, 1], [1, 1]]), frame=robot_frame)
+
+
+def test_positions_to_array_is_not_copied(robot_frame):
+    positions: Positions = Positions.from_array(
+        np.array([[1, 1, 1], [2, 2, 2]]), frame=robot_frame
+    )
+    assert positions.to_array() is positions.to_array()
+    assert positions.to_array().flags["C_CONTIGUOUS"]
+    assert positions.to_array().dtype == np.float64
+
+
+def test_positions_from_list(robot_position_1, robot_position_2, robot_frame):
+    positions = Positions([robot_position_1, robot_position_2], frame=robot_frame)
+    assert len(positions) == 2
+    assert positions.positions == (robot_position_1, robot_position_2)
+    assert np.allclose(positions.to_array(), np.array([[0, 0, 0], [1, 1, 1]]))
+
+
+def test_positions_indexing(robot_frame):
+    positions: Positions = Positions.from_array(
+        np.array([[1, 1, 1], [2, 2, 2], [3, 3, 3]]), frame=robot_frame
+    )
+    assert positions[1] == Position(x=2, y=2, z=2, frame=robot_frame)
+    assert [position.x for position in positions] == [1, 2, 3]
+
+    sliced: Positions = positions[1:]
+    assert len(sliced) == 2
+    assert sliced.frame == robot_frame
+    assert np.shares_memory(sliced.to_array(), positions.to_array())
+
+
+def test_positions_empty(robot_frame):
+    positions = Positions([], frame=robot_frame)
+    assert len(positions) == 0
+    assert positions.to_array().shape == (0, 3)
+
+
+def test_positions_from_array_copy(robot_frame):
+    array = np.array([[1.0, 1.0, 1.0], [2.0, 2.0, 2.0]])
+    copied: Positions = Positions.from_array(array, frame=robot_frame)
+    wrapped: Positions = Positions.from_array(array, frame=robot_frame, copy=False)
+    assert not np.shares_memory(copied.to_array(), array)
+    assert wrapped.to_array() is array
+
+
+def test_positions_from_array_converts_dtype(robot_frame):
+    array = np.array([[1, 1, 1], [2, 2, 2]])
+    positions: Positions = Positions.from_array(array, frame=robot_frame, copy=False)
+    assert positions.to_array().dtype == np.float64
+
+
+def test_positions_from_array_check_finite(robot_frame):
+    array = np.array([[1, 1, 1], [np.nan, 2, 2]])
+    Positions.from_array(array, frame=robot_frame)
+    with pytest.raises(ValueError):
+        Positions.from_array(array, frame=robot_frame, check_finite=True)
+
+
+def test_positions_from_array_preserves_dtype(robot_frame):
+    array = np.array([[1, 1, 1], [2, 2, 2]], dtype=np.float32)
+    positions: Positions = Positions.from_array(array, frame=robot_frame, copy=False)
+    assert positions.dtype == np.float32
+    assert positions.to_array() is array
+    assert positions.to_array(dtype=float).dtype == np.float64
+
+    converted: Positions = Positions.from_array(array, frame=robot_frame, dtype=float)
+    assert converted.dtype == np.float64
+    with pytest.raises(ValueError):
+        Positions.from_array(array, frame=robot_frame, dtype=int)
+
+
+def test_position_to_array_dtype(robot_frame):
+    position = Position(x=1, y=2, z=3, frame=robot_frame)
+    assert position.to_array().dtype == np.float64
+    assert position.to_array(dtype=np.float32).dtype == np.float32
+
+
+def test_position_slots(robot_frame):
+    position = Position(x=1, y=2, z=3, frame=robot_frame)
+    assert not hasattr(position, "__dict__")
+    with pytest.raises(AttributeError):
+        position.w = 4  # type: ignore
+
+
+def test_positions_dacite(robot_frame):
+    positions: Positions = dacite.from_dict(
+        Positions,
+        {
+            "positions": [{"x": 1, "y": 2, "z": 3, "frame": {"name": "robot"}}],
+            "frame": {"name": "robot"},
+        },
+    )
+    assert positions.frame == robot_frame
+    assert np.allclose(positions.to_array(), [[1, 2, 3]])
+    assert [field.name for field in dataclasses.fields(Positions)] == ["frame"]
+
+
+def test_positions_attribute_is_immutable(robot_positions, robot_position_1):
+    with pytest.raises(AttributeError):
+        robot_positions.positions.append(robot_position_1)  # type: ignore
+
+    robot_positions.positions = [robot_position_1]
+    assert np.array_equal(robot_positions.to_array(), [[0, 0, 0]])
@@ -1,3 +1,5 @@
+import dataclasses
+
 import numpy as np
 import pytest
 
@@ -15,3 +17,10 @@ def test_translation_array(robot_frame, asset_frame):
 def test_translation_invalid_array(robot_frame, asset_frame):
     with pytest.raises(ValueError):
         Translation.from_array(np.array([1, 1]), from_=robot_frame, to_=asset_frame)
+
+
+def test_translation_frozen(robot_frame, asset_frame):
+    translation = Translation(x=1, y=2, from_=robot_frame, to_=asset_frame)
+    assert not hasattr(translation, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        translation.x = 3  # type: ignore
@@ -1,10 +1,28 @@
+from typing import List
+
 import numpy as np
 import pytest
-
-from alitra import Frame, Position, Positions, Transform, align_maps, align_positions
-
-
-def test_align_positions_translation_only():
+from scipy.spatial.transform import Rotation
+
+from alitra import (
+    AlignmentResult,
+    Frame,
+    Map,
+    MapAlignment,
+    Position,
+    Positions,
+    Transform,
+    align_maps,
+    align_maps_batch,
+    align_positions,
+    align_positions_ransac,
+    alignment,
+)
+from alitra.alignment import _get_edges, _get_edges_between_coordinates
+
+
+@pytest.mark.parametrize("method", ["edges", "centroid"])
+def test_align_positions_translation_only(method):
     expected_rotation = np.array([0, 0, 0])
     expected_translation = np.array([1, -1, 0])
 
@@ -33,14 +51,18 @@ def test_align_positions_translation_only():
     )
 
     transform: Transform = align_positions(
-        positions_from=robot_positions, positions_to=asset_positions, rot_axes="xyz"
+        positions_from=robot_positions,
+        positions_to=asset_positions,
+        rot_axes="xyz",
+        method=method,
     )
 
     assert np.allclose(expected_rotation, transform.rotation.as_euler("ZYX"))
     assert np.allclose(expected_translation, transform.translation.to_array())
 
 
-def test_align_positions_one_dimension():
+@pytest.mark.parametrize("method", ["edges", "centroid"])
+def test_align_positions_one_dimension(method):
     expected_rotation = np.array([np.pi / 2, 0, 0])
     expected_translation = np.array([0, 0, 0])
 
@@ -69,14 +91,18 @@ def test_align_positions_one_dimension():
     )
 
     transform: Transform = align_positions(
-        positions_from=robot_positions, positions_to=asset_positions, rot_axes="xyz"
+        positions_from=robot_positions,
+        positions_to=asset_positions,
+        rot_axes="xyz",
+        method=method,
     )
 
     assert np.allclose(expected_rotation, transform.rotation.as_euler("ZYX"))
     assert np.allclose(expected_translation, transform.translation.to_array())
 
 
-def test_align_positions_three_dimensions():
+@pytest.mark.parametrize("method", ["edges", "centroid"])
+def test_align_positions_three_dimensions(method):
     expected_rotation = np.array([np.pi / 2, np.pi / 4, np.pi / 2])
     expected_translation = np.array([0, 0, 0])
     hyp = np.sqrt(1 / 2)
@@ -106,14 +132,18 @@ def test_align_positions_three_dimensions():
     )
 
     transform: Transform = align_positions(
-        positions_from=robot_positions, positions_to=asset_positions, rot_axes="xyz"
+        positions_from=robot_positions,
+        positions_to=asset_positions,
+        rot_axes="xyz",
+        method=method,
     )
 
     assert np.allclose(expected_rotation, transform.rotation.as_euler("zyx"))
     assert np.allclose(expected_translation, transform.translation.to_array())
 
 
-def test_align_positions_rotation_and_translation():
+@pytest.mark.parametrize("method", ["edges", "centroid"])
+def test_align_positions_rotation_and_translation(method):
     expected_rotation = np.array([np.pi / 2, 0, 0])
     expected_translation = np.array([2, -1, 0])
 
@@ -142,17 +172,25 @@ def test_align_positions_rotation_and_translation():
     )
 
     transform: Transform = align_positions(
-        positions_from=robot_positions, positions_to=asset_positions, rot_axes="xyz"
+        positions_from=robot_positions,
+        positions_to=asset_positions,
+        rot_axes="xyz",
+        method=method,
     )
 
     assert np.allclose(expected_rotation, transform.rotation.as_euler("ZYX"))
     assert np.allclose(expected_translation, transform.translation.to_array())
 
 
-def test_align_maps(robot_map, asset_map, default_position, robot_frame, asset_frame):
+@pytest.mark.parametrize("method", ["edges", "centroid"])
+def test_align_maps(
+    robot_map, asset_map, default_position, robot_frame, asset_frame, method
+):
     expected_position: Position = Position(80, 10, 0, frame=asset_frame)
 
-    transform = align_maps(map_from=robot_map, map_to=asset_map, rot_axes="z")
+    transform = align_maps(
+        map_from=robot_map, map_to=asset_map, rot_axes="z", method=method
+    )
 
     position_to = transform.transform_position(
         positions=default_position,
@@ -200,7 +238,8 @@ def test_align_positions_not_enough_positions_three_rotations(robot_frame, asset
         )
 
 
-def test_align_positions_outside_rsme_treshold(robot_frame, asset_frame):
+@pytest.mark.parametrize("method", ["edges", "centroid"])
+def test_align_positions_outside_rsme_treshold(robot_frame, asset_frame, method):
     positions_from = Positions.from_array(
         np.array([[20, 10, 0], [60, 20, 0], [80, 70, 0]]), frame=robot_frame
     )
@@ -210,5 +249,209 @@ def test_align_positions_outside_rsme_treshold(robot_frame, asset_frame):
     )
     with pytest.raises(ValueError):
         align_positions(
-            positions_from=positions_from, positions_to=positions_to, rot_axes="z"
+            positions_from=positions_from,
+            positions_to=positions_to,
+            rot_axes="z",
+            method=method,
         )
+
+
+def test_get_edges_between_coordinates(robot_frame):
+    positions_arr = np.random.default_rng(0).uniform(-10, 10, size=(20, 3))
+    positions = Positions.from_array(positions_arr, frame=robot_frame)
+    expected_edges = np.array(
+        [
+            positions_arr[i] - positions_arr[j]
+            for i in range(20)
+            for j in range(i + 1, 20)
+        ]
+    )
+    assert np.array_equal(_get_edges_between_coordinates(positions), expected_edges)
+    assert np.array_equal(
+        _get_edges_between_coordinates(positions, chunk_size=7), expected_edges
+    )
+
+
+def test_get_edges_not_unique(robot_frame, asset_frame):
+    positions_from = Positions.from_array(
+        np.array([[0, 0, 0], [1, 0, 0], [1, 0.01, 0]]), frame=robot_frame
+    )
+    positions_to = Positions.from_array(
+        np.array([[0, 0, 0], [1, 0, 0], [2, 0, 0]]), frame=asset_frame
+    )
+    with pytest.raises(ValueError):
+        _get_edges(positions_from, positions_to, rot_axes="z")
+
+
+@pytest.mark.parametrize("method", ["edges", "centroid"])
+@pytest.mark.parametrize("rot_axes", ["x", "y", "z", "xyz"])
+def test_align_positions_coincident(method, rot_axes, robot_frame, asset_frame):
+    positions_from = Positions.from_array(np.ones((5, 3)), frame=robot_frame)
+    positions_to = Positions.from_array(np.full((5, 3), 2.0), frame=asset_frame)
+    with pytest.raises(ValueError):
+        align_positions(positions_from, positions_to, rot_axes, method=method)
+
+
+def test_align_positions_centroid_collinear(robot_frame, asset_frame):
+    line = np.outer(np.arange(5.0), [1, 1, 0])
+    positions_from = Positions.from_array(line, frame=robot_frame)
+    positions_to = Positions.from_array(line + 1, frame=asset_frame)
+    align_positions(positions_from, positions_to, "z", method="centroid")
+    with pytest.raises(ValueError):
+        align_positions(positions_from, positions_to, "xyz", method="centroid")
+
+
+@pytest.mark.parametrize("rot_axes", ["x", "y", "z", "xyz"])
+def test_align_positions_centroid_equals_edges(rot_axes, robot_frame, asset_frame):
+    rng = np.random.default_rng(1)
+    euler = {
+        "x": [0, 0, 0.7],
+        "y": [0, 0.7, 0],
+        "z": [0.7, 0, 0],
+        "xyz": [0.7, -0.3, 1.2],
+    }[rot_axes]
+    positions_from_arr = rng.uniform(-50, 50, size=(30, 3))
+    positions_to_arr = Rotation.from_euler("ZYX", euler).apply(
+        positions_from_arr
+    ) + np.array([3, -2, 1])
+    positions_to_arr += rng.normal(scale=0.05, size=positions_to_arr.shape)
+    positions_from = Positions.from_array(positions_from_arr, frame=robot_frame)
+    positions_to = Positions.from_array(positions_to_arr, frame=asset_frame)
+
+    transform_edges: Transform = align_positions(
+        positions_from, positions_to, rot_axes=rot_axes, method="edges"
+    )
+    transform_centroid: Transform = align_positions(
+        positions_from, positions_to, rot_axes=rot_axes, method="centroid"
+    )
+    assert np.allclose(
+        transform_edges.rotation.as_euler("ZYX"),
+        transform_centroid.rotation.as_euler("ZYX"),
+        atol=1e-2,
+    )
+    assert np.allclose(
+        transform_edges.translation.to_array(),
+        transform_centroid.translation.to_array(),
+        atol=1e-1,
+    )
+
+
+def test_align_positions_unknown_method(robot_positions, asset_frame):
+    positions_to = Positions.from_array(robot_positions.to_array(), frame=asset_frame)
+    with pytest.raises(ValueError):
+        align_positions(robot_positions, positions_to, rot_axes="z", method="other")
+
+
+@pytest.fixture()
+def positions_with_outlier(robot_frame, asset_frame):
+    rng = np.random.default_rng(2)
+    positions_from_arr = rng.uniform(-50, 50, size=(40, 3))
+    positions_to_arr = Rotation.from_euler("ZYX", [0.7, 0, 0]).apply(
+        positions_from_arr
+    ) + np.array([3, -2, 1])
+    positions_to_arr += rng.normal(scale=0.02, size=positions_to_arr.shape)
+    positions_to_arr[7] += np.array([40, 40, 0])
+    return (
+        Positions.from_array(positions_from_arr, frame=robot_frame),
+        Positions.from_array(positions_to_arr, frame=asset_frame),
+    )
+
+
+def test_align_positions_ransac(positions_with_outlier):
+    positions_from, positions_to = positions_with_outlier
+    with pytest.raises(ValueError):
+        align_positions(positions_from, positions_to, rot_axes="z")
+
+    transform, inliers = align_positions_ransac(
+        positions_from, positions_to, rot_axes="z", seed=0
+    )
+    expected_inliers = np.ones(40, dtype=bool)
+    expected_inliers[7] = False
+    assert np.array_equal(inliers, expected_inliers)
+    assert np.allclose(
+        transform.rotation.as_euler("ZYX"), np.array([0.7, 0, 0]), atol=1e-3
+    )
+    assert np.allclose(
+        transform.translation.to_array(), np.array([3, -2, 1]), atol=1e-1
+    )
+
+
+def test_align_positions_ransac_deterministic(positions_with_outlier):
+    positions_from, positions_to = positions_with_outlier
+    transform, inliers = align_positions_ransac(
+        positions_from, positions_to, rot_axes="xyz", seed=3, max_iterations=200
+    )
+    transform_parallel, inliers_parallel = align_positions_ransac(
+        positions_from,
+        positions_to,
+        rot_axes="xyz",
+        seed=3,
+        max_iterations=200,
+        max_workers=4,
+    )
+    assert np.array_equal(inliers, inliers_parallel)
+    assert np.allclose(transform.as_matrix(), transform_parallel.as_matrix())
+
+
+def test_align_positions_ransac_no_consensus(robot_frame, asset_frame):
+    rng = np.random.default_rng(4)
+    positions_from = Positions.from_array(
+        rng.uniform(-50, 50, size=(10, 3)), frame=robot_frame
+    )
+    positions_to = Positions.from_array(
+        rng.uniform(-50, 50, size=(10, 3)), frame=asset_frame
+    )
+    with pytest.raises(ValueError):
+        align_positions_ransac(positions_from, positions_to, rot_axes="z", seed=0)
+
+
+def test_align_positions_ransac_no_inliers_after_refit(
+    positions_with_outlier, monkeypatch
+):
+    positions_from, positions_to = positions_with_outlier
+    get_inliers = alignment._get_inliers
+    calls = []
+
+    def get_inliers_empty_after_refit(*args, **kwargs):
+        inliers = get_inliers(*args, **kwargs)
+        calls.append(inliers)
+        return inliers if len(calls) == 1 else np.zeros_like(inliers)
+
+    monkeypatch.setattr(alignment, "_get_inliers", get_inliers_empty_after_refit)
+    with pytest.raises(ValueError):
+        align_positions_ransac(positions_from, positions_to, rot_axes="z", seed=0)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("use_processes", [True, False])
+def test_align_maps_batch(robot_map, asset_map, use_processes):
+    map_alignment = MapAlignment(
+        name="robot_to_asset", map_from=robot_map, map_to=asset_map
+    )
+    short_map = Map(
+        name="short_map",
+        frame=robot_map.frame,
+        reference_positions=robot_map.reference_positions[:2],
+    )
+    results: List[AlignmentResult] = align_maps_batch(
+        [map_alignment, (asset_map, robot_map), (short_map, asset_map)],
+        rot_axes="z",
+        max_workers=2,
+        use_processes=use_processes,
+    )
+
+    assert [result.name for result in results] == [
+        "robot_to_asset",
+        "test_map_asset -> test_map_robot",
+        "short_map -> test_map_asset",
+    ]
+    expected_transform = align_maps(robot_map, asset_map, rot_axes="z")
+    assert results[0].error is None
+    assert np.allclose(results[0].transform.as_matrix(), expected_transform.as_matrix())
+    assert results[1].error is None
+    assert np.allclose(
+        results[1].transform.as_matrix(), expected_transform.as_matrix(inverse=True)
+    )
+    assert results[2].transform is None
+    assert isinstance(results[2].error, ValueError)
+    assert all(result.duration >= 0 for result in results)
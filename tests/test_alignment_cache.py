@@ -0,0 +1,65 @@
+import numpy as np
+
+from alitra import AlignmentCache, Map, align_maps
+
+
+def test_alignment_cache_memory(robot_map, asset_map):
+    cache = AlignmentCache()
+    transform = align_maps(robot_map, asset_map, rot_axes="z", cache=cache)
+    assert align_maps(robot_map, asset_map, rot_axes="z", cache=cache) is transform
+    assert (
+        align_maps(robot_map, asset_map, rot_axes="z", rsmd_threshold=1, cache=cache)
+        is not transform
+    )
+
+
+def test_alignment_cache_disk(robot_map, asset_map, tmp_path):
+    transform = align_maps(
+        robot_map, asset_map, rot_axes="z", cache=AlignmentCache(tmp_path)
+    )
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    cache = AlignmentCache(tmp_path)
+    key = cache.get_key(robot_map, asset_map, "z", 0.4, "edges")
+    cached_transform = cache.get(key)
+    assert cached_transform is not None
+    assert cached_transform.from_ == transform.from_
+    assert cached_transform.to_ == transform.to_
+    assert np.allclose(cached_transform.as_matrix(), transform.as_matrix())
+
+
+def test_alignment_cache_key(robot_map, asset_map):
+    key = AlignmentCache.get_key(robot_map, asset_map, "z", 0.4, "edges")
+    assert key == AlignmentCache.get_key(robot_map, asset_map, "z", 0.4, "edges")
+    assert key != AlignmentCache.get_key(asset_map, robot_map, "z", 0.4, "edges")
+    assert key != AlignmentCache.get_key(robot_map, asset_map, "xyz", 0.4, "edges")
+    assert key != AlignmentCache.get_key(robot_map, asset_map, "z", 0.5, "edges")
+    assert key != AlignmentCache.get_key(robot_map, asset_map, "z", 0.4, "centroid")
+
+    moved_map = Map(
+        name=robot_map.name,
+        frame=robot_map.frame,
+        reference_positions=robot_map.reference_positions[:2],
+    )
+    assert key != AlignmentCache.get_key(moved_map, asset_map, "z", 0.4, "edges")
+
+
+def test_alignment_cache_eviction(robot_map, asset_map, tmp_path):
+    cache = AlignmentCache(tmp_path, max_memory_entries=1, max_disk_bytes=300)
+    for rsmd_threshold in [0.4, 0.5, 0.6]:
+        align_maps(
+            robot_map,
+            asset_map,
+            rot_axes="z",
+            rsmd_threshold=rsmd_threshold,
+            cache=cache,
+        )
+    assert len(cache._memory) == 1
+    assert 0 < sum(path.stat().st_size for path in tmp_path.glob("*.json")) <= 300
+
+
+def test_alignment_cache_unreadable_file(robot_map, asset_map, tmp_path):
+    cache = AlignmentCache(tmp_path)
+    key = cache.get_key(robot_map, asset_map, "z", 0.4, "edges")
+    (tmp_path / f"{key}.json").write_text("not json")
+    assert cache.get(key) is None
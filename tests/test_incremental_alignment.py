@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from alitra import IncrementalAligner, Position, Positions, align_positions
+
+
+@pytest.fixture()
+def position_pairs(robot_frame, asset_frame):
+    rng = np.random.default_rng(5)
+    positions_from = rng.uniform(-50, 50, size=(20, 3)) + np.array([5e5, 7e6, 0])
+    positions_to = Rotation.from_euler("ZYX", [0.7, 0.1, -0.2]).apply(
+        positions_from
+    ) + np.array([3, -2, 1])
+    positions_to += rng.normal(scale=0.02, size=positions_to.shape)
+    return (
+        Positions.from_array(positions_from, frame=robot_frame),
+        Positions.from_array(positions_to, frame=asset_frame),
+    )
+
+
+@pytest.mark.parametrize("rot_axes", ["z", "xyz"])
+def test_incremental_aligner(position_pairs, robot_frame, asset_frame, rot_axes):
+    positions_from, positions_to = position_pairs
+    aligner = IncrementalAligner(robot_frame, asset_frame, rot_axes=rot_axes)
+    keys = [
+        aligner.add(position_from, position_to)
+        for position_from, position_to in zip(positions_from, positions_to)
+    ]
+    assert len(aligner) == 20
+
+    expected = align_positions(
+        positions_from,
+        positions_to,
+        rot_axes=rot_axes,
+        rsmd_threshold=np.inf,
+        method="centroid",
+    )
+    assert np.allclose(aligner.transform.as_matrix(), expected.as_matrix())
+
+    for key in keys[:5]:
+        aligner.remove(key)
+    expected = align_positions(
+        positions_from[5:],
+        positions_to[5:],
+        rot_axes=rot_axes,
+        rsmd_threshold=np.inf,
+        method="centroid",
+    )
+    assert np.allclose(aligner.transform.as_matrix(), expected.as_matrix())
+
+
+def test_incremental_aligner_rsmd_threshold(position_pairs, robot_frame, asset_frame):
+    positions_from, positions_to = position_pairs
+    aligner = IncrementalAligner(robot_frame, asset_frame, rot_axes="xyz")
+    for position_from, position_to in zip(positions_from, positions_to):
+        aligner.add(position_from, position_to)
+    aligner.check_rsmd_threshold()
+
+    outlier = positions_to[0].to_array() + np.array([100, 0, 0])
+    key = aligner.add(positions_from[0], Position.from_array(outlier, asset_frame))
+    with pytest.raises(ValueError):
+        aligner.check_rsmd_threshold()
+    aligner.remove(key)
+    aligner.check_rsmd_threshold()
+
+
+def test_incremental_aligner_errors(robot_frame, asset_frame):
+    aligner = IncrementalAligner(robot_frame, asset_frame, rot_axes="xyz")
+    with pytest.raises(ValueError):
+        aligner.transform
+    aligner.add(Position(0, 0, 0, robot_frame), Position(0, 0, 0, asset_frame))
+    aligner.add(Position(1, 0, 0, robot_frame), Position(1, 0, 0, asset_frame))
+    with pytest.raises(ValueError):
+        aligner.transform
+    with pytest.raises(ValueError):
+        aligner.add(Position(0, 0, 0, asset_frame), Position(0, 0, 0, asset_frame))
+    with pytest.raises(ValueError):
+        aligner.remove(10)
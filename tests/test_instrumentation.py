@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from alitra import Positions, align_positions
+from alitra.instrumentation import (
+    CallStatistics,
+    add_listener,
+    listening,
+    remove_listener,
+)
+
+
+def test_instrumentation_listener(robot_to_asset_transform, robot_frame, asset_frame):
+    events = []
+    positions = Positions.from_array(np.ones((5, 3)), robot_frame)
+
+    def listener(name, size, duration):
+        if name.startswith("Transform."):
+            events.append((name, size, duration))
+
+    add_listener(listener)
+    robot_to_asset_transform.transform_position(positions, robot_frame, asset_frame)
+    robot_to_asset_transform.transform_position(
+        positions=positions[0], from_=robot_frame, to_=asset_frame
+    )
+    remove_listener(listener)
+    robot_to_asset_transform.transform_position(positions, robot_frame, asset_frame)
+
+    assert [(name, size) for name, size, _ in events] == [
+        ("Transform.transform_position", 5),
+        ("Transform.transform_position", 1),
+    ]
+    assert all(duration >= 0 for _, _, duration in events)
+    with pytest.raises(ValueError):
+        remove_listener(listener)
+
+
+def test_instrumentation_call_statistics(
+    robot_to_asset_transform, robot_frame, asset_frame
+):
+    positions_from = Positions.from_array(
+        np.random.default_rng(0).uniform(-10, 10, size=(20, 3)), robot_frame
+    )
+    positions_to = robot_to_asset_transform.transform_position(
+        positions_from, robot_frame, asset_frame
+    )
+
+    with listening(CallStatistics()) as statistics:
+        align_positions(positions_from, positions_to, rot_axes="xyz")
+
+    assert statistics["align_positions"].count == 1
+    assert statistics["align_positions"].total_size == 20
+    assert statistics["_check_rsme_treshold"].count == 1
+    assert (
+        statistics["_check_rsme_treshold"].max_duration
+        <= statistics["align_positions"].total_duration
+    )
+
+
+def test_instrumentation_reports_failed_calls(robot_frame):
+    with listening(CallStatistics()) as statistics:
+        with pytest.raises(ValueError):
+            Positions.from_array(np.ones((4, 2)), robot_frame)
+    assert statistics["Positions.from_array"].count == 1
+    assert statistics["Positions.from_array"].total_size == 4
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from alitra import Bounds, Frame, Map, MapRegistry, Position, Positions
+
+
+def _make_map(name: str, corner1, corner2, frame: Frame) -> Map:
+    return Map(
+        name=name,
+        frame=frame,
+        reference_positions=Positions([], frame=frame),
+        bounds=Bounds(
+            Position(x=corner1[0], y=corner1[1], z=corner1[2], frame=frame),
+            Position(x=corner2[0], y=corner2[1], z=corner2[2], frame=frame),
+        ),
+    )
+
+
+@pytest.fixture()
+def maps(asset_frame):
+    rng = np.random.default_rng(6)
+    corners = rng.uniform(0, 1000, size=(200, 3))
+    sizes = rng.uniform(1, 100, size=(200, 3))
+    sizes[:, 2] = 0
+    maps = [
+        _make_map(f"map_{index}", corner, corner + size, asset_frame)
+        for index, (corner, size) in enumerate(zip(corners, sizes))
+    ]
+    maps.append(_make_map("site", [0, 0, -10], [2000, 2000, 10], asset_frame))
+    return maps
+
+
+def test_map_registry_query(maps, asset_frame):
+    registry = MapRegistry(maps)
+    assert len(registry) == 201
+
+    rng = np.random.default_rng(7)
+    positions = Positions.from_array(
+        np.vstack(
+            [
+                rng.uniform(-100, 2100, size=(500, 3)) * np.array([1, 1, 0.01]),
+                [map.bounds.position1.to_array() for map in maps[:50]],
+                [[5000, 0, 0], [np.nan, 0, 0]],
+            ]
+        ),
+        frame=asset_frame,
+    )
+
+    expected = np.full(len(positions), -1)
+    for position_index, position in enumerate(positions):
+        for map_index, map in enumerate(maps):
+            if np.isfinite(position.x) and map.bounds.position_within_bounds(position):
+                expected[position_index] = map_index
+                break
+
+    assert np.array_equal(registry.query(positions), expected)
+    assert np.array_equal(registry.query(positions.to_array()), expected)
+    assert registry.get_map(positions[500]) is maps[0]
+    assert registry.get_map(Position(5000, 0, 0, frame=asset_frame)) is None
+
+
+def test_map_registry_small_grid(maps, asset_frame):
+    registry = MapRegistry(maps, max_cells=8)
+    positions = np.random.default_rng(8).uniform(0, 1000, size=(300, 3))
+    positions[:, 2] = 0
+    assert np.array_equal(registry.query(positions), MapRegistry(maps).query(positions))
+
+
+def test_map_registry_errors(maps, robot_frame, asset_frame):
+    with pytest.raises(ValueError):
+        MapRegistry([])
+    with pytest.raises(ValueError):
+        MapRegistry(maps + [_make_map("robot", [0, 0, 0], [1, 1, 1], robot_frame)])
+    with pytest.raises(ValueError):
+        MapRegistry([Map("no_bounds", asset_frame, Positions([], frame=asset_frame))])
+    registry = MapRegistry(maps)
+    with pytest.raises(ValueError):
+        registry.query(Positions.from_array(np.zeros((1, 3)), frame=robot_frame))
@@ -0,0 +1,266 @@
+import asyncio
+import json
+import sys
+
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from alitra import Frame, TransformClient, TransformService, TransformTree
+
+
+@pytest.fixture()
+def service(robot_to_asset_transform):
+    return TransformService(TransformTree([robot_to_asset_transform]), max_latency=0.01)
+
+
+def test_service_batches_concurrent_requests(
+    service, robot_to_asset_transform, robot_frame, asset_frame
+):
+    positions = np.random.default_rng(1).uniform(-10, 10, size=(50, 4, 3))
+
+    async def run():
+        async with service:
+            return await asyncio.gather(
+                *[
+                    service.transform_positions(request, robot_frame, asset_frame)
+                    for request in positions
+                ]
+            )
+
+    results = asyncio.run(run())
+    for request, result in zip(positions, results):
+        assert np.allclose(
+            result,
+            robot_to_asset_transform.transform_array(request, robot_frame, asset_frame),
+        )
+    assert service.statistics.n_requests == 50
+    assert service.statistics.n_positions == 200
+    assert service.statistics.n_batches < 50
+
+
+def test_service_max_batch_size(robot_to_asset_transform, robot_frame, asset_frame):
+    service = TransformService(
+        TransformTree([robot_to_asset_transform]), max_batch_size=10, max_latency=1
+    )
+
+    async def run():
+        async with service:
+            await asyncio.gather(
+                *[
+                    service.transform_positions(
+                        np.zeros((5, 3)), robot_frame, asset_frame
+                    )
+                    for _ in range(10)
+                ]
+            )
+
+    asyncio.run(run())
+    assert service.statistics.n_batches == 5
+    assert service.statistics.max_latency < 1
+
+
+def test_service_poses(service, robot_to_asset_transform, robot_frame, asset_frame):
+    positions = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    quaternions = Rotation.from_rotvec([[0, 0, 0.1], [0.2, 0, 0]]).as_quat()
+
+    async def run():
+        async with service:
+            return await asyncio.gather(
+                service.transform_poses(
+                    positions, quaternions, asset_frame, robot_frame
+                ),
+                service.transform_positions(positions, asset_frame, robot_frame),
+            )
+
+    (pose_positions, pose_quaternions), result = asyncio.run(run())
+    expected = robot_to_asset_transform.transform_array(
+        positions, asset_frame, robot_frame
+    )
+    assert np.allclose(pose_positions, expected)
+    assert np.allclose(result, expected)
+    expected_rotation = robot_to_asset_transform.transform_rotation(
+        Rotation.from_quat(quaternions), asset_frame, robot_frame
+    )
+    assert np.allclose(
+        (Rotation.from_quat(pose_quaternions) * expected_rotation.inv()).magnitude(), 0
+    )
+
+
+def test_service_tcp(service, robot_to_asset_transform, robot_frame, asset_frame):
+    positions = np.random.default_rng(2).uniform(-10, 10, size=(20, 3))
+
+    async def run():
+        server = await service.start_tcp_server()
+        port = server.sockets[0].getsockname()[1]
+        try:
+            async with await TransformClient.connect_tcp("127.0.0.1", port) as client:
+                results = await asyncio.gather(
+                    *[
+                        client.transform_positions(position, robot_frame, asset_frame)
+                        for position in np.split(positions, 4)
+                    ]
+                )
+                with pytest.raises(ValueError):
+                    await client.transform_positions(
+                        positions, robot_frame, Frame("unknown")
+                    )
+                statistics = await client.get_statistics()
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.close()
+        return results, statistics
+
+    results, statistics = asyncio.run(run())
+    assert np.allclose(
+        np.concatenate(results),
+        robot_to_asset_transform.transform_array(positions, robot_frame, asset_frame),
+    )
+    assert statistics["n_requests"] == 5
+    assert statistics["n_positions"] == 40
+
+
+def test_service_tcp_large_request(
+    service, robot_to_asset_transform, robot_frame, asset_frame
+):
+    positions = np.random.default_rng(3).uniform(-10, 10, size=(3000, 3))
+    small_service = TransformService(service.transform_tree, max_batch_size=10)
+
+    async def run():
+        server = await service.start_tcp_server()
+        small_server = await small_service.start_tcp_server()
+        try:
+            async with await TransformClient.connect_tcp(
+                "127.0.0.1", server.sockets[0].getsockname()[1]
+            ) as client:
+                result = await client.transform_positions(
+                    positions, robot_frame, asset_frame
+                )
+            async with await TransformClient.connect_tcp(
+                "127.0.0.1", server.sockets[0].getsockname()[1], limit=2**16
+            ) as client:
+                with pytest.raises(ValueError, match="limit"):
+                    await client.transform_positions(
+                        positions, robot_frame, asset_frame
+                    )
+            async with await TransformClient.connect_tcp(
+                "127.0.0.1", small_server.sockets[0].getsockname()[1]
+            ) as client:
+                with pytest.raises(ValueError, match="limit"):
+                    await client.transform_positions(
+                        positions, robot_frame, asset_frame
+                    )
+                small_result = await client.transform_positions(
+                    positions[:10], robot_frame, asset_frame
+                )
+        finally:
+            for closing in (server, small_server):
+                closing.close()
+                await closing.wait_closed()
+            await service.close()
+            await small_service.close()
+        return result, small_result
+
+    result, small_result = asyncio.run(run())
+    expected = robot_to_asset_transform.transform_array(
+        positions, robot_frame, asset_frame
+    )
+    assert len(json.dumps(positions.tolist())) > 2**16
+    assert np.allclose(result, expected)
+    assert np.allclose(small_result, expected[:10])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets are not available")
+def test_service_unix(
+    service, robot_to_asset_transform, robot_frame, asset_frame, tmp_path
+):
+    positions = np.array([[1.0, 2.0, 3.0]])
+    quaternions = np.array([[0.0, 0.0, 0.0, 1.0]])
+    path = tmp_path / "alitra.sock"
+
+    async def run():
+        server = await service.start_unix_server(path)
+        try:
+            async with await TransformClient.connect_unix(path) as client:
+                return await client.transform_poses(
+                    positions, quaternions, robot_frame, asset_frame
+                )
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.close()
+
+    result_positions, result_quaternions = asyncio.run(run())
+    assert np.allclose(
+        result_positions,
+        robot_to_asset_transform.transform_array(positions, robot_frame, asset_frame),
+    )
+    assert np.allclose(
+        result_quaternions,
+        robot_to_asset_transform.transform_rotation(
+            Rotation.from_quat(quaternions), robot_frame, asset_frame
+        ).as_quat(),
+    )
+
+
+def test_service_close_cancels_collected_requests(
+    robot_to_asset_transform, robot_frame, asset_frame
+):
+    service = TransformService(TransformTree([robot_to_asset_transform]), max_latency=1)
+
+    async def run():
+        await service.start()
+        request = asyncio.create_task(
+            service.transform_positions(np.zeros((1, 3)), robot_frame, asset_frame)
+        )
+        await asyncio.sleep(0.05)
+        await service.close()
+        await asyncio.wait([request], timeout=0.5)
+        return request.cancelled()
+
+    assert asyncio.run(run())
+
+
+def test_service_survives_unexpected_errors(
+    service, robot_to_asset_transform, robot_frame, asset_frame, monkeypatch
+):
+    get_transform = service.transform_tree.get_transform
+
+    def get_transform_broken(from_, to_):
+        if to_ == Frame("broken"):
+            raise RuntimeError("broken")
+        return get_transform(from_, to_)
+
+    monkeypatch.setattr(service.transform_tree, "get_transform", get_transform_broken)
+    positions = np.array([[1.0, 2.0, 3.0]])
+
+    async def run():
+        async with service:
+            broken, result = await asyncio.wait_for(
+                asyncio.gather(
+                    service.transform_positions(
+                        positions, robot_frame, Frame("broken")
+                    ),
+                    service.transform_positions(positions, robot_frame, asset_frame),
+                    return_exceptions=True,
+                ),
+                timeout=5,
+            )
+            assert isinstance(broken, RuntimeError)
+            return result, await service.transform_positions(
+                positions, robot_frame, asset_frame
+            )
+
+    expected = robot_to_asset_transform.transform_array(
+        positions, robot_frame, asset_frame
+    )
+    for result in asyncio.run(run()):
+        assert np.allclose(result, expected)
+
+
+def test_service_not_started(service, robot_frame, asset_frame):
+    with pytest.raises(RuntimeError):
+        asyncio.run(
+            service.transform_positions(np.zeros((1, 3)), robot_frame, asset_frame)
+        )
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from alitra import StreamStatistics, read_chunks, transform_chunks, transform_file
+
+
+@pytest.fixture()
+def positions():
+    return np.random.default_rng(9).uniform(-100, 100, size=(1000, 3))
+
+
+def test_transform_chunks(
+    robot_to_asset_transform, positions, robot_frame, asset_frame
+):
+    statistics = StreamStatistics()
+    chunks = transform_chunks(
+        robot_to_asset_transform,
+        np.array_split(positions, 7),
+        from_=robot_frame,
+        to_=asset_frame,
+        statistics=statistics,
+    )
+    result = np.concatenate(list(chunks))
+    assert np.allclose(
+        result,
+        robot_to_asset_transform.transform_array(positions, robot_frame, asset_frame),
+    )
+    assert statistics.n_points == 1000
+    assert statistics.n_chunks == 7
+    assert statistics.points_per_second > 0
+
+
+def test_transform_chunks_invalid_chunk(
+    robot_to_asset_transform, robot_frame, asset_frame
+):
+    with pytest.raises(ValueError):
+        list(
+            transform_chunks(
+                robot_to_asset_transform, [np.zeros((2, 2))], robot_frame, asset_frame
+            )
+        )
+
+
+@pytest.mark.parametrize("input_suffix", [".npy", ".csv"])
+@pytest.mark.parametrize("output_suffix", [".npy", ".csv"])
+def test_transform_file(
+    robot_to_asset_transform,
+    positions,
+    robot_frame,
+    asset_frame,
+    tmp_path,
+    input_suffix,
+    output_suffix,
+):
+    input_path = tmp_path / f"input{input_suffix}"
+    output_path = tmp_path / f"output{output_suffix}"
+    if input_suffix == ".npy":
+        np.save(input_path, positions)
+    else:
+        np.savetxt(input_path, positions, delimiter=",")
+
+    statistics = transform_file(
+        robot_to_asset_transform,
+        input_path,
+        output_path,
+        robot_frame,
+        asset_frame,
+        chunk_size=300,
+    )
+    assert statistics.n_points == 1000
+    assert statistics.n_chunks == 4
+
+    result = np.concatenate(list(read_chunks(output_path)))
+    assert np.allclose(
+        result,
+        robot_to_asset_transform.transform_array(positions, robot_frame, asset_frame),
+    )
+
+
+def test_transform_file_csv_comments(
+    robot_to_asset_transform, robot_frame, asset_frame, tmp_path
+):
+    positions = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    input_path = tmp_path / "input.csv"
+    output_path = tmp_path / "output.npy"
+    input_path.write_text("# x,y,z\n1,2,3 # first\n\n4,5,6\n")
+
+    transform_file(
+        robot_to_asset_transform, input_path, output_path, robot_frame, asset_frame
+    )
+    assert np.allclose(
+        np.load(output_path),
+        robot_to_asset_transform.transform_array(positions, robot_frame, asset_frame),
+    )
@@ -17,10 +17,24 @@ def test_transform_without_rotation(robot_frame, asset_frame):
         Transform(translation=translation, from_=asset_frame, to_=robot_frame)
 
 
+import tracemalloc
+
 import numpy as np
 import pytest
+from scipy.spatial.transform import Rotation
 
-from alitra import Frame, Orientation, Pose, Position, Positions, Transform, Translation
+from alitra import (
+    Bounds,
+    Frame,
+    Orientation,
+    Orientations,
+    Pose,
+    PoseArray,
+    Position,
+    Positions,
+    Transform,
+    Translation,
+)
 
 
 @pytest.mark.parametrize(
@@ -195,6 +209,33 @@ def test_transform_orientation(
     )
 
 
+def test_transform_orientations(robot_frame, asset_frame):
+    translation = Translation(x=1, y=2, from_=robot_frame, to_=asset_frame)
+    transform = Transform.from_euler_array(
+        translation=translation,
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    orientations = Orientations.from_quat_array(
+        Rotation.random(20, random_state=0).as_quat(), frame=robot_frame
+    )
+
+    orientations_to: Orientations = transform.transform_orientation(
+        orientation=orientations, from_=robot_frame, to_=asset_frame
+    )
+    assert isinstance(orientations_to, Orientations)
+    assert orientations_to.frame == asset_frame
+    for orientation, orientation_to in zip(orientations, orientations_to):
+        expected_orientation: Orientation = transform.transform_orientation(
+            orientation, from_=robot_frame, to_=asset_frame
+        )
+        assert np.allclose(
+            expected_orientation.to_rotation().as_matrix(),
+            orientation_to.to_rotation().as_matrix(),
+        )
+
+
 def test_transform_pose(
     default_transform, default_pose, default_rotation, robot_frame, asset_frame
 ):
@@ -216,3 +257,293 @@ def test_transform_pose(
     )
     assert np.allclose(expected_pose.position.to_array(), pose_to.position.to_array())
     assert expected_pose.frame == pose_to.frame
+
+
+def test_transform_positions_wraps_result(default_transform, robot_frame, asset_frame):
+    p_robot = Positions.from_array(np.random.rand(1000, 3), frame=robot_frame)
+    p_asset = default_transform.transform_position(
+        p_robot, from_=robot_frame, to_=asset_frame
+    )
+    assert isinstance(p_asset, Positions)
+    assert len(p_asset) == 1000
+    assert np.allclose(p_robot.to_array(), p_asset.to_array())
+
+
+def test_transform_pose_array(robot_frame, asset_frame):
+    translation = Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame)
+    transform = Transform.from_euler_array(
+        translation=translation,
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    rng = np.random.default_rng(0)
+    poses = PoseArray.from_array(
+        rng.uniform(-10, 10, size=(50, 3)),
+        Rotation.random(50, random_state=1).as_quat(),
+        robot_frame,
+    )
+
+    poses_to: PoseArray = transform.transform_pose(
+        pose=poses, from_=robot_frame, to_=asset_frame
+    )
+    assert isinstance(poses_to, PoseArray)
+    assert poses_to.frame == asset_frame
+    for pose, pose_to in zip(poses, poses_to):
+        expected_pose: Pose = transform.transform_pose(
+            pose, from_=robot_frame, to_=asset_frame
+        )
+        assert np.allclose(
+            expected_pose.position.to_array(), pose_to.position.to_array()
+        )
+        assert np.allclose(
+            expected_pose.orientation.to_rotation().as_matrix(),
+            pose_to.orientation.to_rotation().as_matrix(),
+        )
+
+    poses_back: PoseArray = transform.transform_pose(
+        pose=poses_to, from_=asset_frame, to_=robot_frame
+    )
+    assert np.allclose(poses_back.positions.to_array(), poses.positions.to_array())
+
+
+def test_transform_as_matrix(robot_frame, asset_frame):
+    translation = Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame)
+    transform = Transform.from_euler_array(
+        translation=translation,
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    position = np.array([1.0, -2.0, 0.5])
+
+    matrix = transform.as_matrix()
+    assert matrix is transform.as_matrix()
+    assert np.allclose(
+        (matrix @ np.append(position, 1))[:3],
+        transform.rotation.apply(position) + translation.to_array(),
+    )
+    assert np.allclose(matrix @ transform.as_matrix(inverse=True), np.eye(4))
+    with pytest.raises(ValueError):
+        matrix[0, 0] = 0
+
+
+def test_transform_replaced_rotation_and_translation(robot_frame, asset_frame):
+    translation = Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame)
+    transform = Transform.from_euler_array(
+        translation=translation,
+        euler=np.array([np.pi / 2, 0, 0]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    position = Position(x=1, y=0, z=0, frame=robot_frame)
+    assert np.allclose(
+        transform.transform_position(position, robot_frame, asset_frame).to_array(),
+        np.array([1, 3, 3]),
+    )
+
+    transform.rotation = Rotation.identity()
+    assert np.allclose(
+        transform.transform_position(position, robot_frame, asset_frame).to_array(),
+        np.array([2, 2, 3]),
+    )
+
+    transform.translation = Translation(x=0, y=0, from_=robot_frame, to_=asset_frame)
+    assert np.allclose(
+        transform.transform_position(position, robot_frame, asset_frame).to_array(),
+        np.array([1, 0, 0]),
+    )
+    assert np.allclose(transform.as_matrix(), np.eye(4))
+
+
+def test_transform_inverse(robot_frame, asset_frame):
+    translation = Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame)
+    transform = Transform.from_euler_array(
+        translation=translation,
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    inverse: Transform = transform.inverse()
+    assert inverse.from_ == asset_frame
+    assert inverse.to_ == robot_frame
+
+    positions = Positions.from_array(np.random.rand(10, 3), frame=asset_frame)
+    assert np.allclose(
+        inverse.transform_position(positions, asset_frame, robot_frame).to_array(),
+        transform.transform_position(positions, asset_frame, robot_frame).to_array(),
+    )
+
+
+def test_transform_compose(robot_frame, asset_frame):
+    site_frame = Frame("site")
+    robot_to_asset = Transform.from_euler_array(
+        translation=Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame),
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    asset_to_site = Transform.from_euler_array(
+        translation=Translation(x=-5, y=0, z=1, from_=asset_frame, to_=site_frame),
+        euler=np.array([1.2, 0, 0]),
+        from_=asset_frame,
+        to_=site_frame,
+    )
+    robot_to_site: Transform = robot_to_asset.compose(asset_to_site)
+    assert robot_to_site.from_ == robot_frame
+    assert robot_to_site.to_ == site_frame
+
+    positions = Positions.from_array(np.random.rand(10, 3), frame=robot_frame)
+    expected = asset_to_site.transform_position(
+        robot_to_asset.transform_position(positions, robot_frame, asset_frame),
+        asset_frame,
+        site_frame,
+    )
+    assert np.allclose(
+        robot_to_site.transform_position(positions, robot_frame, site_frame).to_array(),
+        expected.to_array(),
+    )
+
+    with pytest.raises(ValueError):
+        asset_to_site.compose(robot_to_asset)
+
+
+def test_transform_position_within_bounds(robot_frame, asset_frame):
+    transform = Transform.from_euler_array(
+        translation=Translation(x=10, y=0, from_=robot_frame, to_=asset_frame),
+        euler=np.array([np.pi / 2, 0, 0]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    bounds = Bounds(
+        Position(0, 0, 0, frame=asset_frame), Position(10, 10, 10, frame=asset_frame)
+    )
+    positions = Positions.from_array(
+        np.array([[1, 1, 1], [1, -1, 1], [20, 1, 1]]), frame=robot_frame
+    )
+
+    positions_within, mask = transform.transform_position_within_bounds(
+        positions, from_=robot_frame, to_=asset_frame, bounds=bounds
+    )
+    assert np.array_equal(mask, np.array([True, False, False]))
+    assert positions_within.frame == asset_frame
+    assert np.allclose(positions_within.to_array(), np.array([[9, 1, 1]]))
+
+    with pytest.raises(ValueError):
+        transform.transform_position_within_bounds(
+            positions,
+            from_=robot_frame,
+            to_=asset_frame,
+            bounds=Bounds(
+                Position(0, 0, 0, frame=robot_frame),
+                Position(1, 1, 1, frame=robot_frame),
+            ),
+        )
+
+
+def test_transform_array(default_transform, robot_frame, asset_frame):
+    positions = np.random.default_rng(10).uniform(-10, 10, size=(10, 3))
+    expected = default_transform.transform_position(
+        Positions.from_array(positions, frame=robot_frame), robot_frame, asset_frame
+    )
+    assert np.allclose(
+        default_transform.transform_array(positions, robot_frame, asset_frame),
+        expected.to_array(),
+    )
+    with pytest.raises(ValueError):
+        default_transform.transform_array(positions, robot_frame, Frame("other"))
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+def test_transform_array_out(robot_frame, asset_frame, inverse):
+    transform = Transform.from_euler_array(
+        translation=Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame),
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    from_, to_ = (asset_frame, robot_frame) if inverse else (robot_frame, asset_frame)
+    positions = np.random.default_rng(11).uniform(-10, 10, size=(100000, 3))
+    expected = transform.transform_array(positions, from_, to_)
+
+    out = np.empty_like(positions)
+    assert transform.transform_array(positions, from_, to_, out=out) is out
+    assert np.allclose(out, expected)
+
+    tracemalloc.start()
+    transform.transform_array(positions, from_, to_, out=out)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < positions.nbytes / 10
+
+    in_place = positions.copy()
+    assert transform.transform_array(in_place, from_, to_, in_place=True) is in_place
+    assert np.allclose(in_place, expected)
+
+    in_place = positions.copy()
+    tracemalloc.start()
+    transform.transform_array(in_place, from_, to_, in_place=True)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < positions.nbytes / 10
+
+    in_place = positions[0].copy()
+    transform.transform_array(in_place, from_, to_, in_place=True)
+    assert np.allclose(in_place, expected[0])
+
+    with pytest.raises(ValueError):
+        transform.transform_array(positions, from_, to_, out=out, in_place=True)
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+def test_transform_array_float32(robot_frame, asset_frame, inverse):
+    transform = Transform.from_euler_array(
+        translation=Translation(x=1, y=2, z=3, from_=robot_frame, to_=asset_frame),
+        euler=np.array([0.4, 0.2, 1]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    from_, to_ = (asset_frame, robot_frame) if inverse else (robot_frame, asset_frame)
+    positions = np.random.default_rng(3).uniform(-10, 10, size=(1000, 3))
+    expected = transform.transform_array(positions, from_, to_)
+
+    result = transform.transform_array(positions.astype(np.float32), from_, to_)
+    assert result.dtype == np.float32
+    assert np.allclose(result, expected, atol=1e-4)
+
+    transformed: Positions = transform.transform_position(
+        Positions.from_array(positions.astype(np.float32), from_), from_, to_
+    )
+    assert transformed.dtype == np.float32
+
+
+def test_transform_array_origin(robot_frame, asset_frame):
+    origin_from = np.array([6.5e5, 7.1e6, 10.0])
+    origin_to = np.array([6.4e5, 7.2e6, 0.0])
+    transform = Transform.from_euler_array(
+        translation=Translation.from_array(
+            origin_to - origin_from + np.array([3, 4, 5]),
+            from_=robot_frame,
+            to_=asset_frame,
+        ),
+        euler=np.array([0, 0, 0.3]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+    local = np.random.default_rng(5).uniform(-100, 100, size=(1000, 3))
+    expected = transform.transform_array(local + origin_from, robot_frame, asset_frame)
+
+    result = transform.transform_array(
+        local.astype(np.float32),
+        robot_frame,
+        asset_frame,
+        origin_from=origin_from,
+        origin_to=origin_to,
+    )
+    assert result.dtype == np.float32
+    assert np.allclose(result + origin_to, expected, atol=1e-3)
+
+    shifted = transform.transform_array(
+        local, robot_frame, robot_frame, origin_from=origin_from, origin_to=origin_to
+    )
+    assert np.allclose(shifted, local + origin_from - origin_to)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from alitra import Positions, Transform, TransformBuffer, Translation
+
+
+def _make_transform(robot_frame, asset_frame, yaw: float, x: float) -> Transform:
+    return Transform.from_euler_array(
+        translation=Translation(x=x, y=0, from_=robot_frame, to_=asset_frame),
+        euler=np.array([yaw, 0, 0]),
+        from_=robot_frame,
+        to_=asset_frame,
+    )
+
+
+@pytest.fixture()
+def transform_buffer(robot_frame, asset_frame):
+    transform_buffer = TransformBuffer(robot_frame, asset_frame, max_size=10)
+    for timestamp in range(5):
+        transform_buffer.add_transform(
+            float(timestamp),
+            _make_transform(robot_frame, asset_frame, timestamp * 0.2, timestamp),
+        )
+    return transform_buffer
+
+
+def test_transform_buffer_interpolation(transform_buffer, robot_frame, asset_frame):
+    transform: Transform = transform_buffer.get_transform(1.25)
+    assert np.allclose(transform.translation.to_array(), np.array([1.25, 0, 0]))
+    assert np.allclose(transform.rotation.as_euler("ZYX"), np.array([0.25, 0, 0]))
+
+    transform = transform_buffer.get_transform(3.0)
+    assert np.allclose(transform.translation.to_array(), np.array([3, 0, 0]))
+    assert np.allclose(transform.rotation.as_euler("ZYX"), np.array([0.6, 0, 0]))
+
+
+def test_transform_buffer_slerp_shortest_path(robot_frame, asset_frame):
+    transform_buffer = TransformBuffer(robot_frame, asset_frame)
+    transform_buffer.add_transform(0.0, _make_transform(robot_frame, asset_frame, 3, 0))
+    transform_buffer.add_transform(
+        1.0, _make_transform(robot_frame, asset_frame, -3, 0)
+    )
+    transform: Transform = transform_buffer.get_transform(0.5)
+    assert np.isclose(abs(transform.rotation.as_euler("ZYX")[0]), np.pi)
+
+
+def test_transform_buffer_transform_position(
+    transform_buffer, robot_frame, asset_frame
+):
+    rng = np.random.default_rng(0)
+    positions = Positions.from_array(rng.uniform(-5, 5, (100, 3)), frame=robot_frame)
+    timestamps = rng.uniform(0, 4, 100)
+
+    result = transform_buffer.transform_position(
+        positions, timestamps, from_=robot_frame, to_=asset_frame
+    )
+    assert result.frame == asset_frame
+    for position, timestamp, position_to in zip(positions, timestamps, result):
+        expected = transform_buffer.get_transform(timestamp).transform_position(
+            position, from_=robot_frame, to_=asset_frame
+        )
+        assert np.allclose(expected.to_array(), position_to.to_array())
+
+    back = transform_buffer.transform_position(
+        result, timestamps, from_=asset_frame, to_=robot_frame
+    )
+    assert np.allclose(back.to_array(), positions.to_array())
+
+
+def test_transform_buffer_is_bounded(robot_frame, asset_frame):
+    transform_buffer = TransformBuffer(robot_frame, asset_frame, max_size=3)
+    for timestamp in range(10):
+        transform_buffer.add_transform(
+            float(timestamp), _make_transform(robot_frame, asset_frame, 0, timestamp)
+        )
+    assert len(transform_buffer) == 3
+    assert np.allclose(transform_buffer.timestamps, np.array([7, 8, 9]))
+    assert np.allclose(
+        transform_buffer.get_transform(8.5).translation.to_array(),
+        np.array([8.5, 0, 0]),
+    )
+
+
+def test_transform_buffer_errors(transform_buffer, robot_frame, asset_frame):
+    with pytest.raises(ValueError):
+        transform_buffer.get_transform(4.5)
+    with pytest.raises(ValueError):
+        transform_buffer.add_transform(
+            2.0, _make_transform(robot_frame, asset_frame, 0, 0)
+        )
+    with pytest.raises(ValueError):
+        transform_buffer.add_transform(
+            10.0, _make_transform(asset_frame, robot_frame, 0, 0)
+        )
+    with pytest.raises(ValueError):
+        TransformBuffer(robot_frame, asset_frame).get_transform(0.0)
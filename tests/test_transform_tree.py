@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from alitra import Frame, Positions, Transform, TransformTree, Translation
+
+
+def _make_transform(from_: Frame, to_: Frame, yaw: float, x: float) -> Transform:
+    return Transform.from_euler_array(
+        translation=Translation(x=x, y=1, from_=from_, to_=to_),
+        euler=np.array([yaw, 0, 0]),
+        from_=from_,
+        to_=to_,
+    )
+
+
+@pytest.fixture()
+def frames():
+    return Frame("robot"), Frame("map"), Frame("asset"), Frame("site")
+
+
+@pytest.fixture()
+def transform_tree(frames):
+    robot, map_, asset, site = frames
+    return TransformTree(
+        [
+            _make_transform(robot, map_, np.pi / 2, 1),
+            _make_transform(map_, asset, 0.3, -2),
+            _make_transform(site, asset, -1.0, 10),
+        ]
+    )
+
+
+def test_transform_tree_chained_transform(transform_tree, frames):
+    robot, map_, asset, site = frames
+    positions = Positions.from_array(np.random.rand(20, 3), frame=robot)
+
+    expected = positions
+    for from_, to_ in [(robot, map_), (map_, asset), (asset, site)]:
+        expected = transform_tree.transform_position(expected, from_, to_)
+
+    result = transform_tree.transform_position(positions, robot, site)
+    assert result.frame == site
+    assert np.allclose(result.to_array(), expected.to_array())
+
+    back = transform_tree.transform_position(result, site, robot)
+    assert np.allclose(back.to_array(), positions.to_array())
+
+
+def test_transform_tree_caches_transform(transform_tree, frames):
+    robot, _, _, site = frames
+    transform = transform_tree.get_transform(robot, site)
+    assert transform_tree.get_transform(robot, site) is transform
+
+
+def test_transform_tree_invalidates_cache(transform_tree, frames):
+    robot, map_, asset, site = frames
+    position = Positions.from_array(np.array([[1.0, 2.0, 3.0]]), frame=robot)
+    before = transform_tree.transform_position(position, robot, site)
+    robot_to_asset = transform_tree.get_transform(robot, asset)
+
+    transform_tree.add_transform(_make_transform(map_, asset, 0.3, 5))
+    after = transform_tree.transform_position(position, robot, site)
+    assert not np.allclose(before.to_array(), after.to_array())
+    assert transform_tree.get_transform(robot, asset) is not robot_to_asset
+
+
+def test_transform_tree_identity(transform_tree, frames):
+    robot = frames[0]
+    positions = Positions.from_array(np.random.rand(5, 3), frame=robot)
+    result = transform_tree.transform_position(positions, robot, robot)
+    assert np.allclose(result.to_array(), positions.to_array())
+
+
+def test_transform_tree_unconnected_frames(transform_tree, frames):
+    robot, map_, _, _ = frames
+    other = Frame("other")
+    with pytest.raises(ValueError):
+        transform_tree.get_transform(robot, other)
+
+    transform_tree.remove_transform(robot, map_)
+    with pytest.raises(ValueError):
+        transform_tree.get_transform(robot, map_)
+    assert robot not in transform_tree.frames
+    with pytest.raises(ValueError):
+        transform_tree.remove_transform(robot, map_)